@@ -1,10 +1,10 @@
 import argparse
 import yaml
 import os
-import glob
 import sys
 import subprocess
 import logging
+from concurrent.futures import ThreadPoolExecutor
 try:
     from tqdm import tqdm
 except ImportError:
@@ -25,6 +25,7 @@ def load_config(config_path):
         return yaml.safe_load(f)
 
 def run_blender_pipeline(config):
+    """Runs the Blender pipeline on the configured models. Returns False if any batch failed."""
     # Setup path
     project_root = os.path.dirname(os.path.abspath(__file__))
     pipeline_script = os.path.join(project_root, "pipeline", "core.py")
@@ -38,18 +39,23 @@ def run_blender_pipeline(config):
     decim_conf = pipeline_conf.get('decimation', {}) # FIX
     skip_remesh = pipeline_conf.get('skip_remesh', False)
     input_folder = pipeline_conf.get('input_folder')
+    reuse_blender = pipeline_conf.get('reuse_blender', False)
+    workers = max(1, int(pipeline_conf.get('workers', 1)))
     
     models = []
     
     if input_folder:
         if not os.path.exists(input_folder):
             logger.error(f"Input folder not found: {input_folder}")
-            return
+            return False
             
-        glb_files = glob.glob(os.path.join(input_folder, "*.glb"))
+        # Single directory pass, no pattern matching or extra stat per entry
+        with os.scandir(input_folder) as entries:
+            glb_files = [e.path for e in entries
+                         if e.name.endswith(".glb") and not e.name.startswith(".") and e.is_file()]
         if not glb_files:
             logger.warning(f"No .glb files found in {input_folder}")
-            return
+            return True
             
         logger.info(f"Found {len(glb_files)} files in {input_folder}")
         # Convert to list of dicts to match previous structure
@@ -60,11 +66,12 @@ def run_blender_pipeline(config):
     
     if not models:
         logger.warning("No models found in config (checked 'input_folder' and 'models').")
-        return
+        return True
 
     # Blender command detection (assuming it's in PATH)
     blender_exe = "blender"
     
+    input_paths = []
     for i, model_entry in enumerate(models):
         input_path = model_entry.get('path')
         if not input_path:
@@ -75,49 +82,62 @@ def run_blender_pipeline(config):
             logger.error(f"Input file not existing: {input_path}")
             continue
             
-        # Determine specific output directory
-        # core.py uses the output path to decide where to place files.
-        # If we pass a folder, it will save inside it.
+        input_paths.append(input_path)
         
-        logger.info(f"Starting processing for: {input_path}")
+    # Reuse long-lived Blender processes (pays Blender startup only once per worker),
+    # models split round-robin between them
+    if reuse_blender and input_paths:
+        n_procs = min(workers, len(input_paths))
+        batches = [input_paths[w::n_procs] for w in range(n_procs)]
+    else:
+        batches = [[p] for p in input_paths]
         
-        # Command Construction
-        # blender -b -P pipeline/core.py -- --input <in> --output <out> --decimation_presets <qual> --image_resolution <res>
+    # Shared arguments, the input list is added per batch
+    # blender -b -P pipeline/core.py -- --input <in> [<in> ...] --output <out> --decimation_presets <qual> --image_resolution <res>
+    base_args = [
+        "--output", output_base_dir,
+        "--decimation_presets", quality,
+        "--image_resolution", str(image_resolution)
+    ]
+    
+    # Add Remesh Override Parameters if present
+    if 'tolerance' in remesh_conf and remesh_conf['tolerance'] is not None:
+         base_args.extend(["--remesh_tolerance", str(remesh_conf['tolerance'])])
+         
+    if 'edge_min' in remesh_conf and remesh_conf['edge_min'] is not None:
+         base_args.extend(["--remesh_edge_min", str(remesh_conf['edge_min'])])
+         
+    if 'edge_max' in remesh_conf and remesh_conf['edge_max'] is not None:
+         base_args.extend(["--remesh_edge_max", str(remesh_conf['edge_max'])])
+         
+    if 'iterations' in remesh_conf and remesh_conf['iterations'] is not None:
+         base_args.extend(["--remesh_iterations", str(remesh_conf['iterations'])])
+    
+    # Add Decimation Override Parameters
+    if 'hausdorff_threshold' in decim_conf and decim_conf['hausdorff_threshold'] is not None:
+         base_args.extend(["--final_hausdorff", str(decim_conf['hausdorff_threshold'])])
+
+    # Skip remesh if configured
+    if skip_remesh:
+        base_args.append("--skip_remesh")
+        
+    def run_batch(batch, position=0):
+        logger.info(f"Starting processing for: {', '.join(batch)}")
         
+        # Command Construction
         cmd = [
             blender_exe,
             "-b", # Background mode
             "-P", pipeline_script,
             "--", # Separator for python script arguments
-            "--input", input_path,
-            "--output", output_base_dir,
-            "--decimation_presets", quality,
-            "--image_resolution", str(image_resolution)
+            "--input", *batch,
+            *base_args
         ]
-        
-        # Add Remesh Override Parameters if present
-        if 'tolerance' in remesh_conf and remesh_conf['tolerance'] is not None:
-             cmd.extend(["--remesh_tolerance", str(remesh_conf['tolerance'])])
-             
-        if 'edge_min' in remesh_conf and remesh_conf['edge_min'] is not None:
-             cmd.extend(["--remesh_edge_min", str(remesh_conf['edge_min'])])
-             
-        if 'edge_max' in remesh_conf and remesh_conf['edge_max'] is not None:
-             cmd.extend(["--remesh_edge_max", str(remesh_conf['edge_max'])])
-             
-        if 'iterations' in remesh_conf and remesh_conf['iterations'] is not None:
-             cmd.extend(["--remesh_iterations", str(remesh_conf['iterations'])])
-        
-        # Add Decimation Override Parameters
-        if 'hausdorff_threshold' in decim_conf and decim_conf['hausdorff_threshold'] is not None:
-             cmd.extend(["--final_hausdorff", str(decim_conf['hausdorff_threshold'])])
-
-        # Skip remesh if configured
-        if skip_remesh:
-            cmd.append("--skip_remesh")
 
         # logger.info(f"Executing command: {' '.join(cmd)}")
         
+        desc = os.path.basename(batch[0]) if len(batch) == 1 else f"{len(batch)} models"
+        
         try:
             # We run in background with Popen to monitor progress
             with subprocess.Popen(
@@ -136,7 +156,7 @@ def run_blender_pipeline(config):
                 # Init progress bar if tqdm available
                 if tqdm:
                     # Estimate phases: ~12 per loop
-                    pbar = tqdm(total=12, desc=f"Processing {os.path.basename(input_path)}", unit="phase")
+                    pbar = tqdm(total=12 * len(batch), desc=f"Processing {desc}", unit="phase", position=position)
                 
                 for line in process.stdout:
                     line = line.strip()
@@ -155,10 +175,10 @@ def run_blender_pipeline(config):
                             # 1 Final Phase (12)
                             # Total = 4 + (7 * n_meshes)
                             # (Note: Phase 4 matches Loop start implicitly)
+                            # Each model replaces its initial estimate of 12 phases.
                             
-                            new_total = 4 + (7 * n_meshes)
                             if pbar is not None:
-                                pbar.total = new_total
+                                pbar.total += 4 + (7 * n_meshes) - 12
                                 pbar.refresh()
                         except ValueError:
                             pass
@@ -182,13 +202,38 @@ def run_blender_pipeline(config):
                 return_code = process.wait()
                 
                 if return_code != 0:
-                    logger.error(f"Error during elaboration of {input_path}")
+                    logger.error(f"Error during elaboration of {', '.join(batch)}")
                     logger.error("BLENDER OUTPUT:\n" + "\n".join(full_output))
-                else:
-                    logger.info(f"Completed: {input_path}")
+                    return False
+                logger.info(f"Completed: {', '.join(batch)}")
+                return True
 
         except Exception as e:
             logger.error(f"Generic error executing subprocess: {e}")
+            return False
+
+    # Each worker drives its own Blender process (Blender is process-safe, not thread-safe)
+    failed = []
+    if workers > 1 and len(batches) > 1:
+        logger.info(f"Running {len(batches)} Blender jobs with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(batch, executor.submit(run_batch, batch, i % workers)) for i, batch in enumerate(batches)]
+            for batch, future in futures:
+                # result() re-raises anything that escaped run_batch (e.g. progress bar errors)
+                try:
+                    if not future.result():
+                        failed.append(batch)
+                except Exception as e:
+                    logger.error(f"Batch {', '.join(batch)} raised: {e}")
+                    failed.append(batch)
+    else:
+        for batch in batches:
+            if not run_batch(batch):
+                failed.append(batch)
+                
+    if failed:
+        logger.error(f"Failed batches ({len(failed)}/{len(batches)}): " + "; ".join(', '.join(b) for b in failed))
+    return not failed
 
 def main():
     parser = argparse.ArgumentParser(description="Mesh Optimizer Orchestrator")
@@ -198,7 +243,8 @@ def main():
     
     try:
         config = load_config(args.config)
-        run_blender_pipeline(config)
+        if not run_blender_pipeline(config):
+            sys.exit(1)
     except Exception as e:
         logger.critical(f"Fatal error: {e}")
         sys.exit(1)
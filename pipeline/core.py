@@ -5,6 +5,7 @@ import logging
 import sys
 import subprocess
 import shutil
+import tempfile
 import urllib.request
 
 # Logging configuration
@@ -23,7 +24,7 @@ try:
     from scene_helper import SceneHelper
     from io_helper import MeshIO
     from preprocess import MeshPreprocessor
-    from remesher import CgalRemesher
+    from remesher import CgalRemesher, CGAL_REMESH_BIN
     from decimate import MeshDecimator
     # Modules imported on-demand or here if preferred
 except ImportError:
@@ -31,7 +32,7 @@ except ImportError:
     from .scene_helper import SceneHelper
     from .io_helper import MeshIO
     from .preprocess import MeshPreprocessor
-    from .remesher import CgalRemesher
+    from .remesher import CgalRemesher, CGAL_REMESH_BIN
     from .decimate import MeshDecimator
 
 def ensure_checkpoint_exists(base_dir: str):
@@ -63,15 +64,34 @@ def ensure_checkpoint_exists(base_dir: str):
         
     return ckpt_path
 
+def analyze_materials(hp_mesh, safe_name: str):
+    """
+    Analyzes the HP materials to decide which maps to bake and which to keep uniform.
+    
+    Returns:
+        tuple: (active_maps, uniform_vals) as returned by TextureAnalyzer.analyze_mesh_materials.
+    """
+    try:
+        from tex_baker import TextureAnalyzer
+        return TextureAnalyzer.analyze_mesh_materials(hp_mesh)
+    except Exception as e:
+        raise RuntimeError(f"Baking failed for {safe_name}: {e}")
+
 def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM", image_resolution: int = 2048,
          remesh_tolerance=None, remesh_edge_min=None, remesh_edge_max=None, remesh_iterations=None,
-         final_hausdorff=None, skip_remesh: bool = False):
+         final_hausdorff=None, skip_remesh: bool = False, partuv_timeout: float = 3600):
     """
     Robust mesh optimization pipeline.
     Interrupts execution in case of critical error at any stage.
+    PartUV runs in a subprocess killed after partuv_timeout seconds (None or 0 = no limit),
+    so a pathological mesh fails fast instead of stalling the whole batch.
+    
+    Returns:
+        bool: True if the model was optimized, False on critical error.
     """
     logger.info("=== Start Mesh Optim Pipeline (Robust Mode) ===")
     
+    temp_dir = None
     try:
         # Pre-Checks
         if not os.path.exists(input_path):
@@ -79,6 +99,16 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
             
         script_dir = os.path.dirname(os.path.abspath(__file__))
         
+        # External tools are checked up front (cheap stat calls), so a missing install
+        # fails here instead of after import, preprocessing and remeshing
+        uv_script = os.path.join(script_dir, "uv_generator.py")
+        config_file = os.path.join(os.path.dirname(script_dir), "config", "config_partuv.yaml")
+        python_exe = "/opt/partuv_env/bin/python" # Specific PartUV Environment
+        if not skip_remesh:
+            for required in (CGAL_REMESH_BIN, python_exe, uv_script, config_file):
+                if not os.path.isfile(required):
+                    raise FileNotFoundError(f"Required file not found: {required}")
+        
         # 1. Scene Cleanup
         logger.info("Phase 1: Scene Cleanup")
         SceneHelper.cleanup_scene()
@@ -120,11 +150,8 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
         project_root = os.path.dirname(script_dir)
         ensure_checkpoint_exists(project_root)
 
-        # Setup Temp
-        import uuid
-        base_temp_dir = "/tmp"
-        temp_dir = os.path.join(base_temp_dir, f"optim_{uuid.uuid4().hex}")
-        if not os.path.exists(temp_dir): os.makedirs(temp_dir)
+        # Setup Temp: private, uniquely named directory created in one call
+        temp_dir = tempfile.mkdtemp(prefix="optim_", dir="/tmp")
         logger.info(f"Using temp directory: {temp_dir}")
         
         input_filename = os.path.splitext(os.path.basename(input_path))[0]
@@ -139,16 +166,17 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
             
             base_name = f"{input_filename}_{safe_name}"
             
-            # Export HP Temp
-            temp_hp = os.path.join(temp_dir, f"{base_name}_hp.obj")
-            if not MeshIO.export(temp_hp, objects=[hp_mesh]):
-                raise RuntimeError(f"Export HP failed for {safe_name}")
-            
             # 5. Remeshing
             if skip_remesh:
                 logger.info(f"Phase 5 [{safe_name}]: CGAL Remeshing SKIPPED (skip_remesh=True)")
-                remeshed_path = temp_hp
+                remeshed_path = None
+                active_maps, uniform_vals = analyze_materials(hp_mesh, safe_name)
             else:
+                # Export HP Temp (input of the external remesher)
+                temp_hp = os.path.join(temp_dir, f"{base_name}_hp.obj")
+                if not MeshIO.export(temp_hp, objects=[hp_mesh]):
+                    raise RuntimeError(f"Export HP failed for {safe_name}")
+                
                 logger.info(f"Phase 5 [{safe_name}]: CGAL Remeshing")
                 temp_remeshed = os.path.join(temp_dir, f"{base_name}_remeshed.obj")
 
@@ -179,7 +207,7 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
                 # logger.info(f"Remesh Params: Tol={r_tol}, Min={r_min}, Max={r_max}, Iter={r_iter}")
 
                 # Use raw remesh instead of adaptive_remesh to control specific params
-                remeshed_path = CgalRemesher.remesh(
+                remesh_handle = CgalRemesher.start(
                     temp_hp,
                     temp_remeshed,
                     tolerance=r_tol,
@@ -187,22 +215,41 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
                     edge_max=r_max,
                     iterations=r_iter
                 )
+                if not remesh_handle:
+                    raise RuntimeError(f"Remeshing failed for {safe_name}")
+
+                try:
+                    # Material analysis only needs the HP mesh: run it while CGAL works
+                    active_maps, uniform_vals = analyze_materials(hp_mesh, safe_name)
 
+                    remeshed_path = CgalRemesher.wait(remesh_handle)
+                finally:
+                    # Never leave CGAL running (writing into temp_dir) if anything above raised
+                    CgalRemesher.stop(remesh_handle)
                 if not remeshed_path:
                     raise RuntimeError(f"Remeshing failed for {safe_name}")
 
             # 6. Initial Decimation
             logger.info(f"Phase 6 [{safe_name}]: Decimation Target 300k")
-            remeshed_objs = MeshIO.load(remeshed_path)
+            if remeshed_path is None:
+                # No remesh: copy the HP mesh in memory instead of an OBJ export/import
+                # round-trip. Materials are not shared with the HP mesh, the bake
+                # material is set up on the copy later.
+                remeshed_objs = [hp_mesh.copy()]
+                remeshed_objs[0].data = hp_mesh.data.copy()
+                remeshed_objs[0].data.materials.clear()
+                bpy.context.scene.collection.objects.link(remeshed_objs[0])
+            else:
+                remeshed_objs = MeshIO.load(remeshed_path)
             if not remeshed_objs:
                 raise RuntimeError(f"Load remeshed obj failed for {safe_name}")
             
             lp_target = remeshed_objs[0]
             if len(remeshed_objs) > 1:
-                bpy.ops.object.select_all(action='DESELECT')
-                for o in remeshed_objs: o.select_set(True)
-                bpy.context.view_layer.objects.active = lp_target
-                bpy.ops.object.join()
+                # Context override instead of scene-wide deselect + reselect
+                with bpy.context.temp_override(active_object=lp_target, selected_objects=remeshed_objs,
+                                               selected_editable_objects=remeshed_objs):
+                    bpy.ops.object.join()
                 
             if not MeshDecimator.apply_decimate(lp_target, preset='CUSTOM', custom_target=300000, hausdorf_threshold=0.001):
                 raise RuntimeError(f"Initial decimation failed for {safe_name}")
@@ -217,10 +264,6 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
                 temp_dec = os.path.join(temp_dir, f"{base_name}_dec.obj")
                 MeshIO.export(temp_dec, objects=[lp_target])
 
-                uv_script = os.path.join(script_dir, "uv_generator.py")
-                config_file = os.path.join(os.path.dirname(script_dir), "config", "config_partuv.yaml")
-                python_exe = "/opt/partuv_env/bin/python" # Specific PartUV Environment
-
                 cmd_uv = [
                     python_exe, uv_script,
                     "--mesh_path", temp_dec,
@@ -229,7 +272,10 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
                     "--pack_method", "none"
                 ]
 
-                proc = subprocess.run(cmd_uv, capture_output=True, text=True)
+                try:
+                    proc = subprocess.run(cmd_uv, capture_output=True, text=True, timeout=partuv_timeout or None)
+                except subprocess.TimeoutExpired:
+                    raise RuntimeError(f"PartUV generation timed out after {partuv_timeout}s for {safe_name}")
                 if proc.returncode != 0:
                     logger.error(f"PartUV Error Output:\n{proc.stderr}")
                     raise RuntimeError(f"PartUV generation failed for {safe_name}")
@@ -252,15 +298,11 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
                 
             # 9. Baking
             logger.info(f"Phase 9 [{safe_name}]: Baking Maps")
-            uniform_vals = {}
             try:
-                from tex_baker import TextureAnalyzer, TextureBaker
+                from tex_baker import TextureBaker
                 out_dir = os.path.dirname(output_path) if os.path.splitext(output_path)[1] else output_path
                 mesh_tex_dir = os.path.join(out_dir, f"tex_{safe_name}")
                 
-                # Analyze materials to decide what to bake vs keep uniform
-                active_maps, uniform_vals = TextureAnalyzer.analyze_mesh_materials(hp_mesh)
-                
                 # If there are maps to bake
                 if active_maps:
                     # Use passed image_resolution
@@ -307,24 +349,23 @@ def main(input_path: str, output_path: str, decimation_presets: str = "MEDIUM",
         if final_optimized_objects:
             final_glb_path = os.path.join(output_path, f"{input_filename}_optimized.glb")
             
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in final_optimized_objects:
-                obj.select_set(True)
-                
+            # Objects are passed explicitly, no need to touch the selection here
             if MeshIO.export(final_glb_path, objects=final_optimized_objects):
                 logger.info(f"=== Pipeline Completed. Output: {final_glb_path} ===")
             else:
                 raise RuntimeError("Final GLB Export failed.")
         else:
             raise RuntimeError("No final optimized objects produced.")
+            
+        return True
 
     except Exception as e:
         logger.error(f"CRITICAL ERROR: {e}")
-        # Terminate process with error code to signal failure
-        sys.exit(1)
+        # Caller terminates the process with error code to signal failure
+        return False
     finally:
-        # Cleanup ALL temporary data
-        if 'temp_dir' in locals() and os.path.exists(temp_dir):
+        # Cleanup ALL temporary data: the whole directory in a single rmtree
+        if temp_dir is not None:
             try:
                 shutil.rmtree(temp_dir)
                 logger.info(f"Cleaned up temporary directory: {temp_dir}")
@@ -338,7 +379,9 @@ if __name__ == "__main__":
         argv = []
 
     parser = argparse.ArgumentParser(description="Mesh Optimization Pipeline")
-    parser.add_argument("--input", type=str, required=True, help="Input mesh file")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--input", type=str, nargs='+', help="Input mesh file(s), processed in this Blender session")
+    inputs.add_argument("--input_manifest", type=str, help="Text file with one input mesh path per line (# for comments), processed in this Blender session")
     parser.add_argument("--output", type=str, required=True, help="Output mesh file")
     parser.add_argument("--decimation_presets", type=str, default="MEDIUM", help="Decimation Preset (LOW, MEDIUM, HIGH, CUSTOM)")
     parser.add_argument("--image_resolution", type=int, default=2048, help="Image resolution")
@@ -355,24 +398,44 @@ if __name__ == "__main__":
     # Remesh skip
     parser.add_argument("--skip_remesh", action="store_true", help="Skip the remeshing step")
 
+    # PartUV limit
+    parser.add_argument("--partuv_timeout", type=float, default=3600, help="PartUV timeout in seconds (0 = no limit)")
+
     parser.add_argument("--no_subfolder", action="store_true", help="Do not create a subfolder with input filename in output dir")
     
     args = parser.parse_args(argv)
     
-    if args.no_subfolder:
-        output_dir = args.output
+    if args.input_manifest:
+        # Long batches without hitting the command line length limit
+        with open(args.input_manifest, 'r') as f:
+            input_paths = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
     else:
-        # Create output directory based on input filename
-        input_filename = os.path.splitext(os.path.basename(args.input))[0]
-        output_dir = os.path.join(args.output, input_filename)
-        
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    main(args.input, output_dir, args.decimation_presets, args.image_resolution,
-         remesh_tolerance=args.remesh_tolerance,
-         remesh_edge_min=args.remesh_edge_min,
-         remesh_edge_max=args.remesh_edge_max,
-         remesh_iterations=args.remesh_iterations,
-         final_hausdorff=args.final_hausdorff,
-         skip_remesh=args.skip_remesh)
+        input_paths = args.input
+    
+    failed = []
+    for input_path in input_paths:
+        if args.no_subfolder:
+            output_dir = args.output
+        else:
+            # Create output directory based on input filename
+            input_filename = os.path.splitext(os.path.basename(input_path))[0]
+            output_dir = os.path.join(args.output, input_filename)
+            
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+            
+        ok = main(input_path, output_dir, args.decimation_presets, args.image_resolution,
+                  remesh_tolerance=args.remesh_tolerance,
+                  remesh_edge_min=args.remesh_edge_min,
+                  remesh_edge_max=args.remesh_edge_max,
+                  remesh_iterations=args.remesh_iterations,
+                  final_hausdorff=args.final_hausdorff,
+                  skip_remesh=args.skip_remesh,
+                  partuv_timeout=args.partuv_timeout)
+        if not ok:
+            failed.append(input_path)
+            
+    if failed:
+        logger.error(f"Failed inputs: {', '.join(failed)}")
+        # Terminate process with error code to signal failure
+        sys.exit(1)
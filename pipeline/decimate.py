@@ -1,6 +1,7 @@
 import bpy
 import bmesh
 import mathutils
+import numpy as np
 from mathutils.bvhtree import BVHTree
 import logging
 
@@ -21,47 +22,53 @@ class MeshDecimator:
     }
 
     @staticmethod
-    def _calculate_hausdorff_one_sided(target_obj, source_obj) -> float:
+    def _source_tree(source_obj) -> BVHTree:
+        """
+        Builds a world-space BVHTree of source_obj straight from its mesh data.
+        The reference copy is never linked to the scene nor carries modifiers, so going
+        through the depsgraph would only materialize a duplicate of the same mesh.
+        """
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(source_obj.data)
+            bm.transform(source_obj.matrix_world) # Apply world transform to temporary bmesh
+            return BVHTree.FromBMesh(bm)
+        finally:
+            bm.free()
+
+    @staticmethod
+    def _calculate_hausdorff_one_sided(target_obj, source_obj, source_tree: BVHTree = None) -> float:
         """
         Calculates one-sided Hausdorff distance (Maximum minimum distance)
         from vertices of target_obj to the surface of source_obj.
         Uses a BVHTree for performance.
+
+        Args:
+            target_obj (bpy.types.Object): Decimated object.
+            source_obj (bpy.types.Object): Original (reference) object.
+            source_tree (BVHTree, optional): World-space tree of source_obj (see _source_tree),
+                                             built here if not given.
         """
-        # Ensure transformations are applied or considered
-        # For simplicity, we work in World Space
-        
-        # Build BVH tree of source object (original)
-        # Note: a dependency graph is needed to get the correct evaluated mesh
-        depsgraph = bpy.context.evaluated_depsgraph_get()
-        source_eval = source_obj.evaluated_get(depsgraph)
-        
-        # Create tree from evaluated mesh (includes global transformations if configured,
-        # but FromObject usually works in local space. Better to apply transforms or handle them).
-        # To be safe, we transform target_obj vertices to source_obj local space
-        # OR use World Space for everything.
-        
-        # World Space approach:
-        # BVHTree.FromObject creates a tree in world coords if applied? No, local.
-        # We build a custom tree with World coordinates.
-        
-        bm = bmesh.new()
-        bm.from_mesh(source_eval.data)
-        bm.transform(source_obj.matrix_world) # Apply world transform to temporary bmesh
-        
-        source_tree = BVHTree.FromBMesh(bm)
-        bm.free()
+        # We work in World Space: the tree is built from world coordinates
+        if source_tree is None:
+            source_tree = MeshDecimator._source_tree(source_obj)
         
         max_dist = 0.0
         
-        # Iterate over target mesh vertices (decimated)
+        # Iterate over target mesh vertices (decimated): coordinates are read in bulk and
+        # moved to world space with one numpy matmul, so the loop builds no Vector per
+        # vertex (neither v.co nor the matrix product)
         target_mesh = target_obj.data
-        target_matrix = target_obj.matrix_world
+        coords = np.empty(len(target_mesh.vertices) * 3, dtype=np.float64)
+        target_mesh.vertices.foreach_get('co', coords)
+        matrix = np.array(target_obj.matrix_world)
+        coords = coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
         
-        for v in target_mesh.vertices:
-            world_co = target_matrix @ v.co
+        find_nearest = source_tree.find_nearest
+        for world_co in coords.tolist():
             # Find nearest point on source mesh
-            location, normal, index, dist = source_tree.find_nearest(world_co)
-            if dist > max_dist:
+            location, normal, index, dist = find_nearest(world_co)
+            if dist is not None and dist > max_dist:
                 max_dist = dist
                 
         return max_dist
@@ -132,6 +139,9 @@ class MeshDecimator:
             bpy.data.meshes.remove(original_mesh_data)
             return True
 
+        # The reference never changes between iterations, build its tree once
+        source_tree = MeshDecimator._source_tree(original_obj)
+
         # Adaptive Loop (Max 6 tries)
         current_target = target_faces
         max_retries = 6
@@ -171,7 +181,7 @@ class MeshDecimator:
             
             # Hausdorff Check
             # Use original_obj as source (High Res) and obj as target (Low Res)
-            dist = MeshDecimator._calculate_hausdorff_one_sided(obj, original_obj)
+            dist = MeshDecimator._calculate_hausdorff_one_sided(obj, original_obj, source_tree)
             
             logger.info(f"{iteration_label}: Ratio={ratio:.4f} -> Faces={new_face_count} | Hausdorff Dist={dist:.6f} (Threshold {adaptive_threshold:.6f})")
             
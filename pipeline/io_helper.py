@@ -1,17 +1,64 @@
 import bpy
 import os
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Union
 
+try:
+    from medit_io import MeditIO
+except ImportError:
+    from .medit_io import MeditIO
+
+# Optional: OpenCV encoder for baked textures (falls back to Blender's img.save)
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
 # Base logging configuration
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MeshIO:
     """
-    Helper class for mesh import and export (OBJ, GLB) using Blender (bpy).
+    Helper class for mesh import and export (OBJ, GLB, MEDIT) using Blender (bpy).
     """
 
+    @staticmethod
+    def _load_medit(file_path: str) -> List[bpy.types.Object]:
+        """
+        Builds a Blender mesh directly from a MEDIT (.mesh/.meshb) file written by MMG,
+        using bulk foreach_set calls instead of going through an OBJ round-trip.
+        
+        Args:
+            file_path (str): Path of the .mesh/.meshb file.
+            
+        Returns:
+            List[bpy.types.Object]: The created mesh object (empty list on error).
+        """
+        vertices, triangles = MeditIO.read(file_path)
+        if vertices is None or len(triangles) == 0:
+            logger.error(f"No triangles found in {file_path}")
+            return []
+
+        n_tri = len(triangles)
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        mesh = bpy.data.meshes.new(name)
+
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set("co", vertices.astype(np.float32).ravel())
+        mesh.loops.add(3 * n_tri)
+        mesh.loops.foreach_set("vertex_index", triangles.astype(np.int32).ravel())
+        mesh.polygons.add(n_tri)
+        # Loop totals are derived from consecutive loop starts
+        mesh.polygons.foreach_set("loop_start", np.arange(0, 3 * n_tri, 3, dtype=np.int32))
+        mesh.update(calc_edges=True)
+
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+        return [obj]
+
     @staticmethod
     def load(file_path: str) -> List[bpy.types.Object]:
         """
@@ -43,7 +90,16 @@ class MeshIO:
                     bpy.ops.import_scene.obj(filepath=file_path)
                     
             elif ext in ['.glb', '.gltf']:
-                bpy.ops.import_scene.gltf(filepath=file_path)
+                # Keep the importer's Python vertex merge disabled: welding is done later
+                # in preprocessing (remove_doubles) on the joined meshes.
+                bpy.ops.import_scene.gltf(filepath=file_path, merge_vertices=False)
+                
+            elif ext in ['.mesh', '.meshb']:
+                # MMG output: skip the OBJ conversion and the OBJ importer entirely.
+                # The created object is returned directly, selection is not used.
+                imported_objects = MeshIO._load_medit(file_path)
+                logger.info(f"Imported {file_path} with {len(imported_objects)} mesh objects.")
+                return imported_objects
             else:
                 logger.error(f"Format not supported: {ext}")
                 return []
@@ -64,7 +120,50 @@ class MeshIO:
             return []
 
     @staticmethod
-    def export(output_path: str, objects: Optional[List[bpy.types.Object]] = None) -> bool:
+    def load_batch(file_paths: List[str]) -> List[bpy.types.Object]:
+        """
+        Loads several files issuing one importer call per directory and format
+        (importer 'files' + 'directory' arguments) instead of one call per file.
+        
+        Args:
+            file_paths (List[str]): Absolute paths of files to load.
+            
+        Returns:
+            List[bpy.types.Object]: List of imported mesh objects.
+        """
+        groups = {}
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                logger.error(f"File not found: {file_path}")
+                continue
+            ext = os.path.splitext(file_path)[1].lower()
+            groups.setdefault((os.path.dirname(file_path), ext), []).append(os.path.basename(file_path))
+            
+        imported_objects = []
+        for (directory, ext), names in groups.items():
+            files = [{"name": name} for name in names]
+            try:
+                if ext in ['.glb', '.gltf']:
+                    bpy.ops.import_scene.gltf(filepath=os.path.join(directory, names[0]), directory=directory,
+                                              files=files, merge_vertices=False)
+                elif ext == '.obj' and hasattr(bpy.ops.wm, 'obj_import'):
+                    bpy.ops.wm.obj_import(filepath=os.path.join(directory, names[0]), directory=directory, files=files)
+                else:
+                    # Formats without multi-file import go through load() one by one
+                    for name in names:
+                        imported_objects.extend(MeshIO.load(os.path.join(directory, name)))
+                    continue
+            except Exception as e:
+                logger.error(f"Error during batch import from {directory}: {e}")
+                continue
+                
+            imported_objects.extend(obj for obj in bpy.context.selected_objects if obj.type == 'MESH')
+            
+        logger.info(f"Imported {len(file_paths)} files with {len(imported_objects)} mesh objects.")
+        return imported_objects
+
+    @staticmethod
+    def export(output_path: str, objects: Optional[List[bpy.types.Object]] = None, compression_level: int = 1) -> bool:
         """
         Exports specified objects (or currently selected ones) to file.
         
@@ -72,6 +171,8 @@ class MeshIO:
             output_path (str): Destination path.
             objects (List[bpy.types.Object], optional): List of objects to export. 
                                                         If None, exports current selection.
+            compression_level (int): PNG zlib level (0-9) for textures the glTF exporter
+                                     has to encode. Default 1: fast, slightly larger files.
             
         Returns:
             bool: True if export successful, False otherwise.
@@ -82,39 +183,64 @@ class MeshIO:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            # Selection management
-            if objects is not None:
-                bpy.ops.object.select_all(action='DESELECT')
-                for obj in objects:
-                    obj.select_set(True)
-            
-            # If still nothing selected, select all meshes
-            if not bpy.context.selected_objects:
-                for obj in bpy.context.scene.objects:
-                    if obj.type == 'MESH':
-                        obj.select_set(True)
+            # Objects to export: given list, else current selection, else all meshes
+            export_objects = list(objects) if objects else list(bpy.context.selected_objects)
+            if not export_objects:
+                export_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
 
             ext = os.path.splitext(output_path)[1].lower()
             
             if ext == '.obj':
+                # The OBJ exporter works on the selection: only touch the objects whose
+                # state changes, no select_all operator
+                selected = bpy.context.selected_objects
+                export_set = set(export_objects)
+                if set(selected) != export_set:
+                    for obj in selected:
+                        if obj not in export_set:
+                            obj.select_set(False)
+                    for obj in export_objects:
+                        obj.select_set(True)
+                
                 if hasattr(bpy.ops.wm, 'obj_export'):
                     bpy.ops.wm.obj_export(filepath=output_path, export_selected_objects=True)
                 else:
                     bpy.ops.export_scene.obj(filepath=output_path, use_selection=True)
                     
             elif ext in ['.glb', '.gltf']:
-                # Enable Draco Compression for GLB/GLTF export
-                bpy.ops.export_scene.gltf(
-                    filepath=output_path, 
-                    use_selection=True,
-                    export_draco_mesh_compression_enable=True,
-                    export_draco_mesh_compression_level=6,
-                    export_draco_position_quantization=14,
-                    export_draco_normal_quantization=10,
-                    export_draco_texcoord_quantization=12,
-                    export_draco_color_quantization=10,
-                    export_draco_generic_quantization=10
-                )
+                # Isolate the objects in a throw-away scene: the exporter then walks
+                # only these objects and the selection is not needed at all.
+                export_scene = bpy.data.scenes.new("export_tmp")
+                # Blender's PNG compression setting is 0-100
+                export_scene.render.image_settings.compression = max(0, min(9, compression_level)) * 10
+                try:
+                    for obj in export_objects:
+                        export_scene.collection.objects.link(obj)
+                        
+                    # The view layer must belong to the export scene too: the exporter's
+                    # evaluated depsgraph and visibility checks read it from the context
+                    with bpy.context.temp_override(scene=export_scene, view_layer=export_scene.view_layers[0]):
+                        # Enable Draco Compression for GLB/GLTF export
+                        bpy.ops.export_scene.gltf(
+                            filepath=output_path, 
+                            use_selection=False,
+                            use_active_scene=True,
+                            # File-backed textures (our baked JPG/PNG) are embedded as-is
+                            export_image_format='AUTO',
+                            # Static meshes only: skip the animation, skinning and shape key passes
+                            export_animations=False,
+                            export_skins=False,
+                            export_morph=False,
+                            export_draco_mesh_compression_enable=True,
+                            export_draco_mesh_compression_level=6,
+                            export_draco_position_quantization=14,
+                            export_draco_normal_quantization=10,
+                            export_draco_texcoord_quantization=12,
+                            export_draco_color_quantization=10,
+                            export_draco_generic_quantization=10
+                        )
+                finally:
+                    bpy.data.scenes.remove(export_scene)
             else:
                 logger.error(f"Extension not recognized for export: {ext}")
                 return False
@@ -127,7 +253,78 @@ class MeshIO:
             return False
 
     @staticmethod
-    def save_images_to_dir(images_dict: dict, output_dir: str, format: str = 'JPEG') -> List[str]:
+    def _read_image_8bit(img: bpy.types.Image, format: str, buf: np.ndarray = None) -> Optional[np.ndarray]:
+        """
+        Reads a Blender image as an 8 bit BGR array for OpenCV: pixels are read in bulk
+        with foreach_get, without Blender's image save path.
+        Float buffers are linear: they are encoded to sRGB unless the image holds
+        non-color data (normal maps, AO, ...).
+        Must run on the main thread (bpy access), the encoding can then go anywhere.
+        
+        Args:
+            buf (np.ndarray, optional): Preallocated float32 scratch buffer, reused if large enough.
+        
+        Returns:
+            np.ndarray: (H, W, 3) uint8 BGR pixels, or None if the image cannot go this way
+                        (no OpenCV, unsupported format), so the caller falls back to img.save().
+        """
+        if cv2 is None or format not in ('PNG', 'JPEG'):
+            return None
+            
+        width, height = img.size
+        channels = img.channels
+        if width == 0 or height == 0 or channels not in (3, 4):
+            return None
+        
+        n_values = width * height * channels
+        if buf is None or buf.size < n_values:
+            buf = np.empty(n_values, dtype=np.float32)
+        buf = buf[:n_values]
+        img.pixels.foreach_get(buf)
+        
+        if img.is_float:
+            np.clip(buf, 0.0, 1.0, out=buf)
+            if img.colorspace_settings.name == 'sRGB':
+                # Linear -> sRGB transfer function
+                low = buf <= 0.0031308
+                lin = buf[low] * 12.92
+                np.power(buf, 1.0 / 2.4, out=buf)
+                buf *= 1.055
+                buf -= 0.055
+                buf[low] = lin
+        
+        # Values are in [0, 1]: scale to 8 bit with rounding
+        buf *= 255.0
+        buf += 0.5
+        # astype copies, so the scratch buffer can be reused right away
+        pixels = buf.reshape(height, width, channels)[::-1, :, :3].astype(np.uint8)  # Blender rows are bottom-up
+        return cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
+
+    @staticmethod
+    def _encode_cv2(pixels: np.ndarray, filepath: str, format: str, compression: int = 3) -> bool:
+        """
+        Encodes and writes an 8 bit BGR array. No bpy access: safe to run in a worker thread
+        (OpenCV releases the GIL while encoding).
+        
+        Args:
+            compression (int): PNG zlib level (0-9).
+        
+        Returns:
+            bool: False on encoder error, so the caller falls back to img.save().
+        """
+        if format == 'PNG':
+            params = [cv2.IMWRITE_PNG_COMPRESSION, max(0, min(9, compression))]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, 90]
+        
+        try:
+            return bool(cv2.imwrite(filepath, pixels, params))
+        except cv2.error as e:
+            logger.warning(f"OpenCV write failed for {filepath}: {e}. Falling back to Blender.")
+            return False
+
+    @staticmethod
+    def save_images_to_dir(images_dict: dict, output_dir: str, format: str = 'JPEG', compression: int = 3) -> List[str]:
         """
         Saves a dictionary of bpy.types.Image objects to disk.
         
@@ -135,6 +332,7 @@ class MeshIO:
             images_dict (dict): { 'map_name': bpy.types.Image }
             output_dir (str): Destination directory.
             format (str): File format (PNG, JPEG, etc.).
+            compression (int): PNG zlib level (0-9) for the OpenCV encoder.
             
         Returns:
             List[str]: List of saved file paths.
@@ -153,14 +351,39 @@ class MeshIO:
         # Optional: 16 bit for data maps if needed, but png 8 bit is standard for web/GLB.
         # bpy.context.scene.render.image_settings.color_depth = '16' 
 
-        for map_name, img in images_dict.items():
-            if not img: continue
-            
-            # Construct filename
-            ext = 'jpg' if format == 'JPEG' else format.lower()
-            filename = f"{map_name}.{ext}"
-            filepath = os.path.join(output_dir, filename)
+        # One scratch buffer for all maps (same resolution bakes), sized on the largest
+        sizes = [img.size[0] * img.size[1] * img.channels for img in images_dict.values() if img]
+        pixel_buf = np.empty(max(sizes), dtype=np.float32) if cv2 is not None and sizes else None
+        
+        # Pixels are read on the main thread, the encodes overlap in a small pool
+        # (and with the next read) since OpenCV releases the GIL
+        pending = []
+        fallback = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for map_name, img in images_dict.items():
+                if not img: continue
+                
+                # Construct filename
+                ext = 'jpg' if format == 'JPEG' else format.lower()
+                filename = f"{map_name}.{ext}"
+                filepath = os.path.join(output_dir, filename)
+                
+                # Fast path: bulk pixel read + OpenCV encode
+                pixels = MeshIO._read_image_8bit(img, format, pixel_buf)
+                if pixels is None:
+                    fallback.append((map_name, img, filepath))
+                    continue
+                future = executor.submit(MeshIO._encode_cv2, pixels, filepath, format, compression)
+                pending.append((map_name, img, filepath, future))
             
+            for map_name, img, filepath, future in pending:
+                if future.result():
+                    saved_paths.append(filepath)
+                    logger.info(f"Saved texture: {filepath}")
+                else:
+                    fallback.append((map_name, img, filepath))
+        
+        for map_name, img, filepath in fallback:
             # Set filepath on image for save_render
             # Note: save_render uses scene settings (so uses the path we give in filepath)
             # But img.save() uses img.filepath_raw and image internal settings.
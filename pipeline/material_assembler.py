@@ -1,6 +1,7 @@
 import bpy
 import logging
 import os
+import re
 
 try:
     from scene_helper import SceneHelper
@@ -10,6 +11,22 @@ except ImportError:
 # Logging configuration
 logger = logging.getLogger(__name__)
 
+# Base mapping of suffixes to Principled BSDF sockets
+_MAP_CONFIG = [
+    {'patterns': ['DIFFUSE', 'ALBEDO', 'COLOR', 'BASE_COLOR'], 'socket': 'Base Color', 'non_color': False, 'y': 300},
+    {'patterns': ['METALLIC', 'METALNESS'], 'socket': 'Metallic', 'non_color': True, 'y': 0},
+    {'patterns': ['ROUGHNESS'], 'socket': 'Roughness', 'non_color': True, 'y': -300},
+    {'patterns': ['NORMAL'], 'socket': 'Normal', 'non_color': True, 'is_normal': True, 'y': -600},
+    {'patterns': ['AO', 'AMBIENT_OCCLUSION'], 'socket': None, 'non_color': False, 'is_ao': True, 'y': 600}, # AO is mixed
+    {'patterns': ['EMISSION', 'EMIT'], 'socket': 'Emission Color', 'non_color': False, 'y': -900},
+    # Opacity
+]
+
+# One precompiled matcher per map type: a pattern at the start of the file name
+# or right after a '_' / '-' separator (case insensitive)
+for _config in _MAP_CONFIG:
+    _config['regex'] = re.compile(r'(?:^|[_-])(?:' + '|'.join(map(re.escape, _config['patterns'])) + ')', re.IGNORECASE)
+
 class MaterialAssembler:
     """
     Class to assemble the final material on the Low Poly mesh using baked textures.
@@ -69,36 +86,13 @@ class MaterialAssembler:
         
         logger.info(f"Found textures: {texture_files}")
         
-        # Base mapping of suffixes to Principled BSDF sockets
-        map_config = [
-            {'patterns': ['DIFFUSE', 'ALBEDO', 'COLOR', 'BASE_COLOR'], 'socket': 'Base Color', 'non_color': False, 'y': 300},
-            {'patterns': ['METALLIC', 'METALNESS'], 'socket': 'Metallic', 'non_color': True, 'y': 0},
-            {'patterns': ['ROUGHNESS'], 'socket': 'Roughness', 'non_color': True, 'y': -300},
-            {'patterns': ['NORMAL'], 'socket': 'Normal', 'non_color': True, 'is_normal': True, 'y': -600},
-            {'patterns': ['AO', 'AMBIENT_OCCLUSION'], 'socket': None, 'non_color': False, 'is_ao': True, 'y': 600}, # AO is mixed
-            {'patterns': ['EMISSION', 'EMIT'], 'socket': 'Emission Color', 'non_color': False, 'y': -900},
-            # Opacity
-        ]
-        
         # Dictionary to track what we loaded (to handle AO mix later)
         loaded_nodes = {}
         
-        for config in map_config:
-            # 1. Try to find texture
-            found_file = None
-            for f in texture_files:
-                for pat in config['patterns']:
-                    f_upper = f.upper()
-                    pat_upper = pat.upper()
-                    if (f"_{pat_upper}" in f_upper or 
-                        f"-{pat_upper}" in f_upper or 
-                        f_upper.startswith(pat_upper) or  
-                        f_upper == f"{pat_upper}.PNG" or f_upper == f"{pat_upper}.JPG" or 
-                        f_upper == f"{pat_upper}.JPEG" or f_upper == f"{pat_upper}.TIF" or 
-                        f_upper == f"{pat_upper}.EXR"):
-                        found_file = f
-                        break
-                if found_file: break
+        for config in _MAP_CONFIG:
+            # 1. Try to find texture (first file matching any of the patterns)
+            search = config['regex'].search
+            found_file = next((f for f in texture_files if search(f)), None)
             
             # 2. If texture found, load it
             if found_file:
@@ -172,7 +166,10 @@ class MaterialAssembler:
             # Ensure 'Occlusion' socket exists
             # Blender 4.0+ API: group.interface.new_socket
             # Blender < 4.0 API: group.inputs.new
-            if not any(sock.name == 'Occlusion' for sock in group.interface.items_tree):
+            # The group is shared by all materials: only an input socket counts (panels and
+            # an output with the same name do not), so repeated runs never add another one
+            if not any(item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name == 'Occlusion'
+                       for item in group.interface.items_tree):
                  group.interface.new_socket(name='Occlusion', in_out='INPUT', socket_type='NodeSocketFloat')
             
             # Create Group Node in material
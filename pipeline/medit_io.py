@@ -0,0 +1,279 @@
+import os
+import logging
+import numpy as np
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MeditIO:
+    """
+    Minimal reader/writer for MEDIT (.mesh ASCII, .meshb binary) surface meshes as used by MMG.
+    Only vertices and triangles are handled.
+    """
+
+    # libMeshb keyword codes
+    _KW_DIMENSION = 3
+    _KW_VERTICES = 4
+    _KW_TRIANGLES = 6
+    _KW_END = 54
+
+    @staticmethod
+    def is_binary(mesh_path: str) -> bool:
+        """Returns True for libMeshb (.meshb) paths."""
+        return mesh_path.lower().endswith('.meshb')
+
+    @staticmethod
+    def read(mesh_path: str):
+        """
+        Reads vertices and triangles from a .mesh or .meshb file.
+
+        Args:
+            mesh_path (str): Input .mesh/.meshb file path.
+
+        Returns:
+            tuple: (vertices (N,3) float64, triangles (M,3) int64 zero-based), or (None, None) on error.
+        """
+        if not os.path.exists(mesh_path):
+            logger.error(f"Input file not found: {mesh_path}")
+            return None, None
+
+        if MeditIO.is_binary(mesh_path):
+            return MeditIO._read_binary(mesh_path)
+
+        with open(mesh_path, 'r') as f:
+            lines = f.read().split('\n')
+
+        vertices = np.empty((0, 3), dtype=np.float64)
+        triangles = np.empty((0, 3), dtype=np.int64)
+
+        i = 0
+        n_lines = len(lines)
+        while i < n_lines:
+            tokens = lines[i].split()
+            i += 1
+            if not tokens or tokens[0].startswith('#'):
+                continue
+
+            keyword = tokens[0]
+            if keyword not in ('Vertices', 'Triangles'):
+                continue
+
+            # Count is either on the same line or on the next non empty one
+            if len(tokens) > 1:
+                count = int(tokens[1])
+            else:
+                while not lines[i].strip():
+                    i += 1
+                count = int(lines[i].split()[0])
+                i += 1
+
+            block = np.array(" ".join(lines[i:i + count]).split(), dtype=np.float64).reshape(count, 4)
+            i += count
+
+            if keyword == 'Vertices':
+                vertices = block[:, :3]
+            else:
+                triangles = block[:, :3].astype(np.int64) - 1  # MEDIT indices are 1-based
+
+        return vertices, triangles
+
+    @staticmethod
+    def _binary_format(data: np.ndarray) -> tuple:
+        """
+        Decodes the libMeshb header (versions 1 to 4).
+
+        Returns:
+            tuple: (real_t, int_t, pos_t) numpy dtypes with the file byte order.
+        """
+        # The leading code (1) tells the byte order
+        order = '<' if np.frombuffer(data, dtype='<i4', count=1)[0] == 1 else '>'
+        version = int(np.frombuffer(data, dtype=f'{order}i4', count=1, offset=4)[0])
+        real_t = np.dtype(f'{order}f4' if version == 1 else f'{order}f8')
+        int_t = np.dtype(f'{order}i8' if version >= 4 else f'{order}i4')
+        pos_t = np.dtype(f'{order}i8' if version >= 3 else f'{order}i4')
+        return real_t, int_t, pos_t
+
+    @staticmethod
+    def _binary_blocks(data: np.ndarray, int_t: np.dtype, pos_t: np.dtype):
+        """
+        Walks the keyword blocks of a memory-mapped libMeshb file, up to End.
+
+        Yields:
+            tuple: (keyword, offset, count): offset of the first record, after the leading
+                   integer; count is that integer (the record count, or the value itself
+                   for scalar keywords such as Dimension).
+        """
+        kw_t = np.dtype('i4').newbyteorder(int_t.byteorder)
+        offset = 8
+        while offset < len(data):
+            keyword = int(np.frombuffer(data, dtype=kw_t, count=1, offset=offset)[0])
+            if keyword == MeditIO._KW_END:
+                return
+            next_pos = int(np.frombuffer(data, dtype=pos_t, count=1, offset=offset + 4)[0])
+            body = offset + 4 + pos_t.itemsize
+            if body + int_t.itemsize > len(data):
+                return
+            count = int(np.frombuffer(data, dtype=int_t, count=1, offset=body)[0])
+            yield keyword, body + int_t.itemsize, count
+            if next_pos <= offset:
+                return
+            offset = next_pos
+
+    @staticmethod
+    def _read_binary(mesh_path: str):
+        """
+        Reads vertices and triangles from a libMeshb (.meshb) file, versions 1 to 4.
+        The file is memory-mapped: float64 coordinates are returned as a view, without copy.
+        """
+        data = np.memmap(mesh_path, dtype=np.uint8, mode='r')
+        real_t, int_t, pos_t = MeditIO._binary_format(data)
+
+        vertices = np.empty((0, 3), dtype=np.float64)
+        triangles = np.empty((0, 3), dtype=np.int64)
+        dim = 3
+
+        for keyword, offset, count in MeditIO._binary_blocks(data, int_t, pos_t):
+            if keyword == MeditIO._KW_DIMENSION:
+                dim = count
+            elif keyword == MeditIO._KW_VERTICES:
+                rec = np.dtype([('co', real_t, (dim,)), ('ref', int_t)])
+                block = np.frombuffer(data, dtype=rec, count=count, offset=offset)
+                vertices = block['co'][:, :3].astype(np.float64, copy=False)
+            elif keyword == MeditIO._KW_TRIANGLES:
+                rec = np.dtype([('v', int_t, (3,)), ('ref', int_t)])
+                block = np.frombuffer(data, dtype=rec, count=count, offset=offset)
+                triangles = block['v'].astype(np.int64) - 1  # MEDIT indices are 1-based
+
+        return vertices, triangles
+
+    @staticmethod
+    def read_bounds(mesh_path: str):
+        """
+        Reads only the Vertices block of a .mesh or .meshb file and returns its bounding box.
+        Triangles are not parsed; binary files are memory-mapped and only the vertex block is touched.
+
+        Returns:
+            tuple: (min (3,), max (3,)) float64, or (None, None) if there are no vertices.
+        """
+        if not os.path.exists(mesh_path):
+            logger.error(f"Input file not found: {mesh_path}")
+            return None, None
+
+        vertices = None
+        if MeditIO.is_binary(mesh_path):
+            data = np.memmap(mesh_path, dtype=np.uint8, mode='r')
+            real_t, int_t, pos_t = MeditIO._binary_format(data)
+            dim = 3
+            for keyword, offset, count in MeditIO._binary_blocks(data, int_t, pos_t):
+                if keyword == MeditIO._KW_DIMENSION:
+                    dim = count
+                elif keyword == MeditIO._KW_VERTICES:
+                    rec = np.dtype([('co', real_t, (dim,)), ('ref', int_t)])
+                    vertices = np.frombuffer(data, dtype=rec, count=count, offset=offset)['co'][:, :3]
+                    break
+        else:
+            with open(mesh_path, 'r') as f:
+                for line in f:
+                    tokens = line.split()
+                    if not tokens or tokens[0] != 'Vertices':
+                        continue
+                    # Count is either on the same line or on the next non empty one
+                    if len(tokens) > 1:
+                        count = int(tokens[1])
+                    else:
+                        count_line = next(f)
+                        while not count_line.strip():
+                            count_line = next(f)
+                        count = int(count_line.split()[0])
+                    block = " ".join(next(f) for _ in range(count))
+                    vertices = np.array(block.split(), dtype=np.float64).reshape(count, 4)[:, :3]
+                    break
+
+        if vertices is None or len(vertices) == 0:
+            return None, None
+        return vertices.min(axis=0).astype(np.float64), vertices.max(axis=0).astype(np.float64)
+
+    @staticmethod
+    def write(mesh_path: str, vertices: np.ndarray, triangles: np.ndarray) -> str:
+        """
+        Writes vertices and (zero-based) triangles to a .mesh or .meshb file.
+
+        Returns:
+            str: Output path.
+        """
+        if MeditIO.is_binary(mesh_path):
+            return MeditIO._write_binary(mesh_path, vertices, triangles)
+
+        with open(mesh_path, 'w') as f:
+            f.write("MeshVersionFormatted 2\n\nDimension 3\n\n")
+            f.write(f"Vertices\n{len(vertices)}\n")
+            np.savetxt(f, np.column_stack((vertices, np.zeros(len(vertices)))), fmt='%.17g %.17g %.17g %d')
+            f.write(f"\nTriangles\n{len(triangles)}\n")
+            np.savetxt(f, np.column_stack((triangles + 1, np.zeros(len(triangles), dtype=np.int64))), fmt='%d')
+            f.write("\nEnd\n")
+        return mesh_path
+
+    @staticmethod
+    def _write_binary(mesh_path: str, vertices: np.ndarray, triangles: np.ndarray) -> str:
+        """
+        Writes a libMeshb version 2 file (float64 coordinates, int32 indices).
+        """
+        vert_rec = np.dtype([('co', '<f8', (3,)), ('ref', '<i4')])
+        tri_rec = np.dtype([('v', '<i4', (3,)), ('ref', '<i4')])
+
+        vert_block = np.zeros(len(vertices), dtype=vert_rec)
+        vert_block['co'] = vertices
+        tri_block = np.zeros(len(triangles), dtype=tri_rec)
+        tri_block['v'] = triangles + 1
+
+        # Each keyword stores the absolute offset of the next one
+        dim_pos = 8
+        vert_pos = dim_pos + 12
+        tri_pos = vert_pos + 12 + vert_block.nbytes
+        end_pos = tri_pos + 12 + tri_block.nbytes
+
+        with open(mesh_path, 'wb') as f:
+            np.array([1, 2], dtype='<i4').tofile(f)
+            np.array([MeditIO._KW_DIMENSION, vert_pos, 3], dtype='<i4').tofile(f)
+            np.array([MeditIO._KW_VERTICES, tri_pos, len(vertices)], dtype='<i4').tofile(f)
+            vert_block.tofile(f)
+            np.array([MeditIO._KW_TRIANGLES, end_pos, len(triangles)], dtype='<i4').tofile(f)
+            tri_block.tofile(f)
+            np.array([MeditIO._KW_END, 0], dtype='<i4').tofile(f)
+        return mesh_path
+
+    @staticmethod
+    def write_obj(obj_path: str, vertices: np.ndarray, triangles: np.ndarray) -> str:
+        """
+        Writes vertices and (zero-based) triangles to a plain OBJ file.
+
+        Returns:
+            str: Output path.
+        """
+        with open(obj_path, 'w') as f:
+            np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
+            np.savetxt(f, triangles + 1, fmt='f %d %d %d')
+        return obj_path
+
+    @staticmethod
+    def split_components(triangles: np.ndarray, n_vertices: int) -> np.ndarray:
+        """
+        Labels the connected components of a triangle mesh (shared vertices).
+
+        Returns:
+            np.ndarray: Component label for each triangle.
+        """
+        # Union-find by repeated min-label propagation with pointer jumping
+        labels = np.arange(n_vertices)
+        while True:
+            tri_min = labels[triangles].min(axis=1)
+            new_labels = labels.copy()
+            for k in range(3):
+                np.minimum.at(new_labels, triangles[:, k], tri_min)
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        return labels[triangles[:, 0]]
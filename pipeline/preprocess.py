@@ -1,11 +1,18 @@
 import bpy
 import bmesh
 import logging
+import numpy as np
+from operator import attrgetter, itemgetter
+from sys import intern
 
 # Base logging configuration
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Group key for meshes without material (interned, like the material names)
+_NO_MATERIAL = intern('NO_MATERIAL')
+_NAME = attrgetter('name')
+
 class MeshPreprocessor:
     """
     Class for mesh preprocessing in Blender:
@@ -27,23 +34,26 @@ class MeshPreprocessor:
         If object has multiple materials, uses the first one.
         If no material, returns 'NO_MATERIAL'.
         """
-        if obj.data.materials:
+        # Single RNA collection access: index directly, empty slot list raises IndexError
+        try:
             mat = obj.data.materials[0]
-            return mat.name if mat else 'NO_MATERIAL'
-        return 'NO_MATERIAL'
+        except IndexError:
+            return _NO_MATERIAL
+        # RNA returns a fresh string on every access: intern it so repeated keys
+        # hit the dict by identity
+        return intern(mat.name) if mat else _NO_MATERIAL
 
     @staticmethod
-    def group_by_material(root_name: str) -> dict:
+    def _collect_meshes(root_name: str) -> list:
         """
-        Groups all mesh objects under root_name by material.
-        
-        Returns:
-            dict: Dictionary {material_name: [list of objects]}
+        Mesh objects under root_name (root included if it is a mesh).
+        Returns an empty list, after logging the reason, if the root is missing or
+        has no meshes, so callers can return early before any per-mesh work.
         """
         root = bpy.data.objects.get(root_name)
         if root is None:
             logger.error(f"Root object '{root_name}' not found")
-            return {}
+            return []
 
         meshes = [obj for obj in root.children_recursive if obj.type == 'MESH']
         
@@ -53,26 +63,309 @@ class MeshPreprocessor:
 
         if not meshes:
             logger.error("No mesh objects found under the root")
+        return meshes
+
+    @staticmethod
+    def _flatten(meshes: list):
+        """
+        Safe flatten: unparent keeping world transform.
+        """
+        for mesh in meshes:
+            world_mat = mesh.matrix_world.copy()
+            mesh.parent = None
+            mesh.matrix_world = world_mat
+
+    # Generic attribute types copied by _numpy_join: data_type -> (foreach property, components, dtype)
+    _ATTRIBUTE_LAYOUT = {
+        'FLOAT': ('value', 1, np.float32),
+        'INT': ('value', 1, np.int32),
+        'INT8': ('value', 1, np.int8),
+        'BOOLEAN': ('value', 1, bool),
+        'INT32_2D': ('value', 2, np.int32),
+        'FLOAT2': ('vector', 2, np.float32),
+        'FLOAT_VECTOR': ('vector', 3, np.float32),
+        'FLOAT_COLOR': ('color', 4, np.float32),
+        'BYTE_COLOR': ('color', 4, np.float32),
+        'QUATERNION': ('value', 4, np.float32),
+    }
+
+    @staticmethod
+    def _numpy_join(meshes: list, name: str, weld: bool = False) -> bpy.types.Mesh:
+        """
+        Builds a new mesh concatenating the source meshes in world space with numpy
+        bulk reads/writes (foreach_get / foreach_set), without bmesh or bpy.ops.
+        Point, corner and face attributes (UVs, colors, material indices, ...) are
+        carried over; edges are rebuilt from the faces.
+        
+        Args:
+            meshes (list): Mesh objects to join (already flattened).
+            name (str): Name of the resulting mesh.
+            weld (bool): If True, vertices with exactly the same position are merged
+                         (point attributes of the first occurrence are kept).
+            
+        Returns:
+            bpy.types.Mesh: The joined mesh data-block.
+        """
+        layout = MeshPreprocessor._ATTRIBUTE_LAYOUT
+        sizes = [(len(o.data.vertices), len(o.data.loops), len(o.data.polygons)) for o in meshes]
+        total_v, total_l, total_f = (int(sum(c)) for c in zip(*sizes))
+        domain_size = {'POINT': total_v, 'CORNER': total_l, 'FACE': total_f}
+        
+        # Union of the copyable attributes (first declaration of a name wins)
+        specs = {}
+        for obj in meshes:
+            for attr in obj.data.attributes:
+                if (attr.name.startswith('.') or attr.name in ('position', 'material_index')
+                        or attr.domain not in domain_size or attr.data_type not in layout):
+                    continue
+                specs.setdefault(attr.name, (attr.domain, attr.data_type))
+                
+        # Output buffers allocated once, filled per source at its offsets
+        coords = np.empty((total_v, 3), dtype=np.float32)
+        corner_verts = np.empty(total_l, dtype=np.int32)
+        loop_starts = np.empty(total_f, dtype=np.int32)
+        mat_indices = np.zeros(total_f, dtype=np.int32)
+        attr_data = {}
+        for attr_name, (domain, data_type) in specs.items():
+            _, n_comp, dtype = layout[data_type]
+            attr_data[attr_name] = np.zeros(domain_size[domain] * n_comp, dtype=dtype)
+            
+        materials = []
+        v_off = l_off = f_off = 0
+        for obj, (n_v, n_l, n_f) in zip(meshes, sizes):
+            me = obj.data
+            
+            co = np.empty(n_v * 3, dtype=np.float32)
+            me.vertices.foreach_get('co', co)
+            matrix = np.array(obj.matrix_world, dtype=np.float64)
+            coords[v_off:v_off + n_v] = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+            
+            verts = np.empty(n_l, dtype=np.int32)
+            me.loops.foreach_get('vertex_index', verts)
+            starts = np.empty(n_f, dtype=np.int32)
+            me.polygons.foreach_get('loop_start', starts)
+            
+            # Negative scale flips the winding, as the join operator does:
+            # reverse the corner order inside each face
+            corner_order = None
+            if np.linalg.det(matrix[:3, :3]) < 0:
+                totals = np.diff(np.append(starts, n_l))
+                face_of_corner = np.repeat(np.arange(n_f), totals)
+                corner_order = 2 * starts[face_of_corner] + totals[face_of_corner] - 1 - np.arange(n_l)
+                verts = verts[corner_order]
+                
+            corner_verts[l_off:l_off + n_l] = verts + v_off
+            loop_starts[f_off:f_off + n_f] = starts + l_off
+            
+            # Remap material indices into the joined material list
+            remap = []
+            for mat in me.materials:
+                if mat not in materials:
+                    materials.append(mat)
+                remap.append(materials.index(mat))
+            if remap:
+                local = np.empty(n_f, dtype=np.int32)
+                me.polygons.foreach_get('material_index', local)
+                mat_indices[f_off:f_off + n_f] = np.asarray(remap, dtype=np.int32)[np.clip(local, 0, len(remap) - 1)]
+                
+            offsets = {'POINT': (v_off, n_v), 'CORNER': (l_off, n_l), 'FACE': (f_off, n_f)}
+            for attr_name, (domain, data_type) in specs.items():
+                src = me.attributes.get(attr_name)
+                if src is None or src.domain != domain or src.data_type != data_type:
+                    continue
+                prop, n_comp, dtype = layout[data_type]
+                off, n = offsets[domain]
+                values = np.empty(n * n_comp, dtype=dtype)
+                src.data.foreach_get(prop, values)
+                if domain == 'CORNER' and corner_order is not None:
+                    values = values.reshape(n, n_comp)[corner_order].ravel()
+                attr_data[attr_name][off * n_comp:(off + n) * n_comp] = values
+                
+            v_off += n_v
+            l_off += n_l
+            f_off += n_f
+            
+        if weld and total_v:
+            # Exact-position dedup on the raw 12-byte keys (+0.0 folds -0.0 into 0.0)
+            keys = np.ascontiguousarray(coords + 0.0).view(np.dtype((np.void, coords.itemsize * 3))).ravel()
+            _, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            coords = coords[first_idx]
+            corner_verts = inverse.ravel().astype(np.int32)[corner_verts]
+            for attr_name, (domain, data_type) in specs.items():
+                if domain == 'POINT':
+                    n_comp = layout[data_type][1]
+                    attr_data[attr_name] = attr_data[attr_name].reshape(total_v, n_comp)[first_idx].ravel()
+            total_v = len(first_idx)
+            
+        new_mesh = bpy.data.meshes.new(name)
+        new_mesh.vertices.add(total_v)
+        new_mesh.vertices.foreach_set('co', coords.ravel())
+        new_mesh.loops.add(total_l)
+        new_mesh.loops.foreach_set('vertex_index', corner_verts)
+        new_mesh.polygons.add(total_f)
+        new_mesh.polygons.foreach_set('loop_start', loop_starts)
+        if materials:
+            new_mesh.polygons.foreach_set('material_index', mat_indices)
+            
+        for attr_name, (domain, data_type) in specs.items():
+            attr = new_mesh.attributes.get(attr_name) or new_mesh.attributes.new(attr_name, data_type, domain)
+            attr.data.foreach_set(layout[data_type][0], attr_data[attr_name])
+            
+        # Keep the active UV map of the first source
+        first_uv = meshes[0].data.uv_layers.active
+        if first_uv is not None and first_uv.name in new_mesh.uv_layers:
+            new_mesh.uv_layers.active = new_mesh.uv_layers[first_uv.name]
+            
+        for mat in materials:
+            new_mesh.materials.append(mat)
+            
+        new_mesh.update(calc_edges=True)
+        if weld:
+            # Faces that collapsed onto repeated vertices are degenerate: drop them
+            new_mesh.validate(clean_customdata=False)
+        return new_mesh
+
+    @staticmethod
+    def _bmesh_join(meshes: list, name: str, merge_distance: float = None,
+                    collection: bpy.types.Collection = None, clean: bool = False) -> bpy.types.Object:
+        """
+        Joins mesh objects into a new object without bpy.ops (no operator dispatch,
+        selection or depsgraph updates): geometry is concatenated with numpy
+        (_numpy_join), then merged by distance in a single bmesh pass.
+        Source objects are removed.
+        
+        Args:
+            meshes (list): Mesh objects to join (already flattened).
+            name (str): Name of the resulting object and mesh.
+            merge_distance (float, optional): If set, merge vertices closer than this.
+            collection (bpy.types.Collection, optional): Collection for the new object.
+                                                         Default: collection of the first source.
+            clean (bool): If True, also run the clean_and_fix steps (loose removal,
+                          normals, triangulation) in the same bmesh pass as the merge.
+            
+        Returns:
+            bpy.types.Object: The joined object.
+        """
+        # Exact duplicates (e.g. glTF primitive seams) are welded during the concatenation,
+        # the bmesh merge then only handles the near ones
+        new_mesh = MeshPreprocessor._numpy_join(meshes, name, weld=merge_distance is not None or clean)
+        
+        # Counts are only gathered when they will be logged
+        log_info = logger.isEnabledFor(logging.INFO)
+        verts_before = len(new_mesh.vertices) if log_info else 0
+        if clean:
+            # One bmesh conversion for merge + cleanup + triangulation
+            MeshPreprocessor._clean_mesh_data(new_mesh, max(merge_distance or 0.0, 0.0001))
+        elif merge_distance is not None:
+            bm = bmesh.new()
+            bm.from_mesh(new_mesh)
+            bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=merge_distance)
+            bm.to_mesh(new_mesh)
+            bm.free()
+        if log_info:
+            logger.info(f"  join: {len(meshes)} objects, {verts_before} -> {len(new_mesh.vertices)} vertices")
+            
+        if collection is None:
+            collection = meshes[0].users_collection[0] if meshes[0].users_collection else bpy.context.scene.collection
+        joined = bpy.data.objects.new(name, new_mesh)
+        collection.objects.link(joined)
+        
+        # Remove sources directly (no delete operator)
+        remove_object, remove_mesh = bpy.data.objects.remove, bpy.data.meshes.remove
+        for obj in meshes:
+            old_mesh = obj.data
+            remove_object(obj, do_unlink=True)
+            if old_mesh.users == 0:
+                remove_mesh(old_mesh)
+                
+        return joined
+
+    @staticmethod
+    def group_by_material(root_name: str) -> dict:
+        """
+        Groups all mesh objects under root_name by material.
+        
+        Returns:
+            dict: Dictionary {material_name: [list of objects]}
+        """
+        meshes = MeshPreprocessor._collect_meshes(root_name)
+        if not meshes:
             return {}
 
-        # Group by material
+        # Group by material: bound append per material, one dict lookup per mesh
         material_groups = {}
+        appenders = {}
+        get_key = MeshPreprocessor._get_material_key
         for mesh in meshes:
-            mat_key = MeshPreprocessor._get_material_key(mesh)
-            if mat_key not in material_groups:
-                material_groups[mat_key] = []
-            material_groups[mat_key].append(mesh)
-
-        logger.info(f"Found {len(material_groups)} material groups:")
-        for mat_name, objs in material_groups.items():
-            logger.info(f"  - {mat_name}: {len(objs)} objects")
+            mat_key = get_key(mesh)
+            append = appenders.get(mat_key)
+            if append is None:
+                group = material_groups[mat_key] = []
+                append = appenders[mat_key] = group.append
+            append(mesh)
+
+        if logger.isEnabledFor(logging.INFO):
+            stats = MeshPreprocessor.group_statistics(material_groups)
+            logger.info(f"Found {stats['group_count']} material groups ({stats['total_meshes']} objects):")
+            for entry in stats['details']:
+                logger.info(f"  - {entry['material']}: {entry['mesh_count']} objects")
 
         return material_groups
 
     @staticmethod
-    def flatten_and_join_by_material(root_name: str, merge_vertices_threshold: float = None) -> list[bpy.types.Object]:
+    def group_statistics(material_groups: dict, include_details: bool = True) -> dict:
+        """
+        Summary of a group_by_material result: one sort plus a single pass.
+        
+        Args:
+            material_groups (dict): {material_name: [objects]}.
+            include_details (bool): If False, only the summary counts are computed
+                                    (no sort, no per-group name lists).
+        
+        Returns:
+            dict: {'group_count', 'total_meshes', 'largest', 'smallest',
+                   'details': [{'material', 'mesh_count', 'mesh_names'}] sorted by size (desc),
+                   empty if include_details is False}
+        """
+        if not include_details:
+            # Summary only: one pass over the groups, no per-mesh work
+            sizes = {mat_name: len(objs) for mat_name, objs in material_groups.items()}
+            return {
+                'group_count': len(sizes),
+                'total_meshes': sum(sizes.values()),
+                'largest': max(sizes, key=sizes.get) if sizes else None,
+                'smallest': min(sizes, key=sizes.get) if sizes else None,
+                'details': []
+            }
+        
+        # (count, material, objects) rows sorted with a C key function; largest and
+        # smallest are then the first and last rows, no extra max/min scan
+        rows = [(len(objs), mat_name, objs) for mat_name, objs in material_groups.items()]
+        rows.sort(key=itemgetter(0), reverse=True)
+        
+        total = 0
+        details = []
+        for n, mat_name, objs in rows:
+            total += n
+            details.append({'material': mat_name, 'mesh_count': n, 'mesh_names': list(map(_NAME, objs))})
+            
+        largest = rows[0][1] if rows else None
+        smallest = rows[-1][1] if rows else None
+            
+        return {
+            'group_count': len(material_groups),
+            'total_meshes': total,
+            'largest': largest,
+            'smallest': smallest,
+            'details': details
+        }
+
+    @staticmethod
+    def flatten_and_join_by_material(root_name: str, merge_vertices_threshold: float = None,
+                                     clean: bool = False) -> list[bpy.types.Object]:
         """
         Joins all meshes under root_name grouping them by material.
+        If clean is True, each joined mesh is also cleaned and triangulated during the join.
         
         Returns:
             list: List of joined mesh objects, one per material
@@ -84,42 +377,27 @@ class MeshPreprocessor:
 
         joined_meshes = []
 
-        for mat_name, meshes in material_groups.items():
-            logger.info(f"Processing material group: {mat_name} ({len(meshes)} objects)")
-            
-            # Safe flatten: unparent keeping world transform
-            for mesh in meshes:
-                world_mat = mesh.matrix_world.copy()
-                mesh.parent = None
-                mesh.matrix_world = world_mat
-
-            # Deselect all
-            bpy.ops.object.select_all(action='DESELECT')
-
-            # Select all meshes in this group
-            for mesh in meshes:
-                mesh.select_set(True)
+        # Flatten every group before joining: source objects are removed by the join,
+        # and a mesh of one group may be the parent of meshes of another group
+        for meshes in material_groups.values():
+            MeshPreprocessor._flatten(meshes)
 
-            # Make one active
-            bpy.context.view_layer.objects.active = meshes[0]
+        # New objects go to a staging collection that is linked to the scene only once
+        # at the end, so the view layer is not resynced after every group
+        staging = bpy.data.collections.new("Joined_Meshes")
 
-            # Join meshes
-            bpy.ops.object.join()
-            combined_mesh = bpy.context.view_layer.objects.active
+        for mat_name, meshes in material_groups.items():
+            logger.info(f"Processing material group: {mat_name} ({len(meshes)} objects)")
             
-            # Rename joined object
-            combined_mesh.name = f"Joined_{mat_name}"
-
-            # Merge vertices if threshold is provided
-            if merge_vertices_threshold is not None:
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.select_all(action='SELECT')
-                bpy.ops.mesh.remove_doubles(threshold=merge_vertices_threshold)
-                bpy.ops.object.mode_set(mode='OBJECT')
+            # Join meshes (and merge vertices if threshold is provided)
+            combined_mesh = MeshPreprocessor._bmesh_join(meshes, f"Joined_{mat_name}", merge_vertices_threshold,
+                                                         collection=staging, clean=clean)
 
             joined_meshes.append(combined_mesh)
             logger.info(f"  -> Created: {combined_mesh.name}")
 
+        bpy.context.scene.collection.children.link(staging)
+
         return joined_meshes
 
     @staticmethod
@@ -132,56 +410,116 @@ class MeshPreprocessor:
         NOTE: This method joins EVERYTHING into a SINGLE mesh.
         To keep materials separated, use flatten_and_join_by_material()
         """
-        root = bpy.data.objects.get(root_name)
-        if root is None:
-            logger.error(f"Root object '{root_name}' not found")
-            return None
-
-        meshes = [obj for obj in root.children_recursive if obj.type == 'MESH']
-        
-        # Add root if it is a mesh
-        if root.type == 'MESH':
-            meshes.append(root)
-
+        meshes = MeshPreprocessor._collect_meshes(root_name)
         if not meshes:
-            logger.error("No mesh objects found under the root")
             return None
 
-        # Safe flatten: unparent keeping world transform
-        for mesh in meshes:
-            world_mat = mesh.matrix_world.copy()
-            mesh.parent = None
-            mesh.matrix_world = world_mat
+        MeshPreprocessor._flatten(meshes)
 
-        # Deselect all
-        bpy.ops.object.select_all(action='DESELECT')
+        # Join meshes (and merge vertices if threshold is provided)
+        combined_mesh = MeshPreprocessor._bmesh_join(meshes, meshes[0].name, merge_vertices_threshold)
 
-        # Select all meshes
-        for mesh in meshes:
-            mesh.select_set(True)
+        return combined_mesh
 
-        # Make one active
-        bpy.context.view_layer.objects.active = meshes[0]
+    @staticmethod
+    def _cleanup_merge_distance(merge_vertices_threshold: float = None, default: float = 0.0001):
+        """
+        Merge distance for clean_and_fix: None when the join already merged
+        with an equal or larger threshold, so the second pass would be a no-op.
+        """
+        if merge_vertices_threshold is not None and merge_vertices_threshold >= default:
+            return None
+        return default
 
-        # Join meshes
-        bpy.ops.object.join()
-        combined_mesh = bpy.context.view_layer.objects.active
+    @staticmethod
+    def _clean_mesh_data(mesh: bpy.types.Mesh, merge_distance: float = 0.0001):
+        """
+        Cleanup steps of clean_and_fix in a single bmesh pass: loose geometry removal,
+        merge by distance, smooth edges, consistent normals and triangulation.
+        
+        Args:
+            mesh (bpy.types.Mesh): Mesh data to clean in place.
+            merge_distance (float, optional): Merge by distance threshold, None to skip.
+        """
+        # Loose vertices (not used by any face) found in bulk from the mesh loops:
+        # covers isolated vertices and vertices only reached by loose edges
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+        loose_vert_idx = np.flatnonzero(np.bincount(loop_verts, minlength=len(mesh.vertices)) == 0)
+        
+        # Loose edges (not used by any face), same way from the loop edges
+        loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('edge_index', loop_edges)
+        edge_faces = np.bincount(loop_edges, minlength=len(mesh.edges))
+        loose_edge_idx = np.flatnonzero(edge_faces == 0)
+        
+        # Merge candidates: duplicates come from seams between separate pieces, so only
+        # vertices on boundary or non-manifold edges (face count != 2) are searched
+        if merge_distance is not None:
+            edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+            mesh.edges.foreach_get('vertices', edge_verts)
+            open_edges = (edge_faces != 2) & (edge_faces > 0)
+            candidates = np.unique(edge_verts.reshape(-1, 2)[open_edges])
+            
+            # Indices after the loose vertices are deleted
+            keep = np.ones(len(mesh.vertices), dtype=bool)
+            keep[loose_vert_idx] = False
+            candidates = (np.cumsum(keep) - 1)[candidates]
+        
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        
+        # Loose vertices and loose edges removed by a single delete: the 'EDGES' context
+        # also drops the input vertices left without edges
+        if len(loose_vert_idx) or len(loose_edge_idx):
+            bm.verts.ensure_lookup_table()
+            bm.edges.ensure_lookup_table()
+            bm_verts = bm.verts
+            bm_edges = bm.edges
+            loose_geom = [bm_verts[i] for i in loose_vert_idx]
+            loose_geom.extend(bm_edges[i] for i in loose_edge_idx)
+            bmesh.ops.delete(bm, geom=loose_geom, context='EDGES')
+        
+        # 1. Merge by distance (Remove Doubles) - Often fixes basic non-manifold
+        merged_verts = []
+        if merge_distance is not None and len(candidates):
+            bm.verts.ensure_lookup_table()
+            bm_verts = bm.verts
+            merged_verts = [bm_verts[i] for i in candidates]
+            bmesh.ops.remove_doubles(bm, verts=merged_verts, dist=merge_distance)
+        
+        # # 2. Fix Non-Manifold (Hole filling attempt)
+        # bmesh.ops.holes_fill(bm, edges=[e for e in bm.edges if e.is_boundary], sides=0)
+        
+        # 3. Remove Loose Geometry left by the merge (loose input geometry is already gone):
+        # edges without faces can only appear around the merged vertices
+        loose_edges = {e for v in merged_verts if v.is_valid for e in v.link_edges if not e.link_faces}
+        if loose_edges:
+            bmesh.ops.delete(bm, geom=list(loose_edges), context='EDGES')
         
-        if merge_vertices_threshold is not None:
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.remove_doubles(threshold=merge_vertices_threshold)
-            bpy.ops.object.mode_set(mode='OBJECT')
+        # 4. Recalculate normals and remove sharp edges
+        for edge in bm.edges:
+            edge.smooth = True
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
 
-        return combined_mesh
+        # 5. Triangulate
+        bmesh.ops.triangulate(bm, faces=bm.faces, quad_method='BEAUTY', ngon_method='BEAUTY')
+        
+        bm.to_mesh(mesh)
+        bm.free()
 
     @staticmethod
-    def clean_and_fix(obj: bpy.types.Object):
+    def clean_and_fix(obj: bpy.types.Object, merge_distance: float = 0.0001):
         """
         Performs mesh cleanup:
         1. Select & Fix non-manifold (merge doubles, fill simple holes)
         2. Remove loose geometry
         3. Triangulation
+        
+        Args:
+            obj (bpy.types.Object): Mesh to clean.
+            merge_distance (float, optional): Merge by distance threshold.
+                                              None skips the merge (already done by the join).
         """
         if obj is None or obj.type != 'MESH':
             logger.warning("Object not valid for preprocessing.")
@@ -189,39 +527,17 @@ class MeshPreprocessor:
 
         logger.info(f"Starting mesh cleanup for: {obj.name}")
         
-        MeshPreprocessor._set_active_object(obj)
-        
-        # Switch to Edit Mode
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        # 1. Merge by distance (Remove Doubles) - Often fixes basic non-manifold
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.remove_doubles(threshold=0.0001)
-        
-        # # 2. Fix Non-Manifold (Hole filling attempt)
-        # bpy.ops.mesh.select_all(action='DESELECT')
-        # bpy.ops.mesh.select_non_manifold()
-        # bpy.ops.mesh.fill_holes(sides=0) # 0 = infinite sides allowed
-        
-        # 3. Remove Loose Geometry (isolated vertices/edges/faces)
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.delete_loose()
+        # Everything runs on a bmesh in Object Mode: no mode switches or operator round-trips
+        mesh = obj.data
+        MeshPreprocessor._clean_mesh_data(mesh, merge_distance)
         
-        # 4. Recalculate normals and remove sharp edges
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.mark_sharp(clear=True)
         # Clear custom split normals if present
-        if obj.data.has_custom_normals:
-             bpy.ops.mesh.customdata_custom_splitnormals_clear()
-             
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-
-        # 5. Triangulate
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.quads_convert_to_tris(quad_method='BEAUTY', ngon_method='BEAUTY')
+        if mesh.has_custom_normals:
+            with bpy.context.temp_override(object=obj, active_object=obj):
+                bpy.ops.mesh.customdata_custom_splitnormals_clear()
         
-        # Return to Object Mode
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # No per-mesh update here: bm.to_mesh already wrote the data, callers
+        # refresh the view layer once after processing all meshes
         
         logger.info(f"Preprocessing completed for: {obj.name}")
 
@@ -237,18 +553,20 @@ class MeshPreprocessor:
             list: List of processed mesh objects, one for each material
         """
         # 1. Join by material
+        # 2. Clean, Fix & Triangulate each mesh, in the same bmesh pass as the join merge
+        #    (joined meshes carry no custom split normals, nothing else to clear)
         joined_meshes = MeshPreprocessor.flatten_and_join_by_material(
             root_name, 
-            merge_vertices_threshold
+            merge_vertices_threshold,
+            clean=True
         )
         
         if not joined_meshes:
             logger.warning("No meshes to process")
             return []
-        
-        # 2. Clean, Fix & Triangulate each mesh
-        for mesh in joined_meshes:
-            MeshPreprocessor.clean_and_fix(mesh)
+            
+        # Single depsgraph update for all meshes
+        bpy.context.view_layer.update()
         
         logger.info(f"Process completed: {len(joined_meshes)} final meshes")
         return joined_meshes
@@ -271,6 +589,7 @@ class MeshPreprocessor:
             return None
         
         # 2. Clean, Fix & Triangulate
-        MeshPreprocessor.clean_and_fix(final_mesh)
+        MeshPreprocessor.clean_and_fix(final_mesh, MeshPreprocessor._cleanup_merge_distance(merge_vertices_threshold))
+        bpy.context.view_layer.update()
         
         return final_mesh
\ No newline at end of file
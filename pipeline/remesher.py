@@ -3,6 +3,11 @@ import subprocess
 import logging
 import gmsh
 
+try:
+    from medit_io import MeditIO
+except ImportError:
+    from .medit_io import MeditIO
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -64,12 +69,12 @@ class GmshConverter:
             output_path = os.path.splitext(mesh_path)[0] + ".obj"
 
         try:
-            if not gmsh.isInitialized():
-                gmsh.initialize()
-            
-            gmsh.clear()
-            gmsh.merge(mesh_path)
-            gmsh.write(output_path)
+            # Direct numpy read/write: no Gmsh initialization needed
+            vertices, triangles = MeditIO.read(mesh_path)
+            if vertices is None or len(triangles) == 0:
+                logger.error(f"No triangles found in {mesh_path}")
+                return None
+            MeditIO.write_obj(output_path, vertices, triangles)
             logger.info(f"MESH -> OBJ conversion completed: {output_path}")
             return output_path
         except Exception as e:
@@ -98,7 +103,33 @@ class CgalRemesher:
         cgal_bin: str = CGAL_REMESH_BIN
     ) -> str:
         """
-        Executes adaptive remeshing using CGAL.
+        Executes adaptive remeshing using CGAL (blocking, see start/wait).
+        
+        Args: see start().
+            
+        Returns:
+            str: Output file path if successful, None otherwise.
+        """
+        handle = CgalRemesher.start(input_path, output_path, tolerance, edge_min, edge_max, iterations, cgal_bin)
+        if handle is None:
+            return None
+        return CgalRemesher.wait(handle)
+
+    @staticmethod
+    def start(
+        input_path: str,
+        output_path: str = None,
+        tolerance: float = 0.001,
+        edge_min: float = None,
+        edge_max: float = None,
+        iterations: int = 5,
+        cgal_bin: str = CGAL_REMESH_BIN
+    ):
+        """
+        Launches adaptive remeshing using CGAL without waiting for it,
+        so the caller can do other work while the binary runs.
+        The tool output goes to a log file next to the output (not to a pipe nobody
+        reads until wait(), which would block a verbose run once the buffer fills).
         
         Args:
             input_path (str): Input mesh file path (OBJ, OFF, PLY).
@@ -114,7 +145,8 @@ class CgalRemesher:
             cgal_bin (str): CGAL remesh binary path. Default: /opt/remesh
             
         Returns:
-            str: Output file path if successful, None otherwise.
+            tuple: (subprocess.Popen, output_path, log_path) handle to pass to wait() or stop(),
+                   None on error.
         """
         if not os.path.exists(input_path):
             logger.error(f"Input file not found: {input_path}")
@@ -144,17 +176,56 @@ class CgalRemesher:
         
         logger.info(f"Executing CGAL remesh: {' '.join(cmd)}")
         
+        log_path = f"{os.path.splitext(output_path)[0]}_cgal.log"
+        try:
+            # The child keeps its own descriptor, ours can be closed right away
+            with open(log_path, 'w') as log_file:
+                proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, text=True)
+            return proc, output_path, log_path
+        except Exception as e:
+            logger.error(f"Exception during CGAL remesh execution: {e}")
+            return None
+
+    @staticmethod
+    def stop(handle):
+        """
+        Kills a remeshing started with start() if it is still running and reaps it.
+        Safe to call after wait().
+        
+        Args:
+            handle (tuple): Value returned by start().
+        """
+        proc = handle[0]
+        if proc.poll() is None:
+            logger.warning("Stopping CGAL remesh process")
+            proc.kill()
+        proc.wait()
+
+    @staticmethod
+    def wait(handle) -> str:
+        """
+        Waits for a remeshing started with start() and checks its output.
+        
+        Args:
+            handle (tuple): Value returned by start().
+            
+        Returns:
+            str: Output file path if successful, None otherwise.
+        """
+        proc, output_path, log_path = handle
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            proc.wait()
+            with open(log_path, 'r', errors='replace') as f:
+                stdout = f.read()
             
-            if result.returncode != 0:
-                logger.error(f"CGAL remesh Error (Code {result.returncode}): {result.stderr}")
-                logger.error(f"CGAL Output: {result.stdout}")
+            if proc.returncode != 0:
+                logger.error(f"CGAL remesh Error (Code {proc.returncode})")
+                logger.error(f"CGAL Output: {stdout}")
                 return None
             
             # Log tool output
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
+            if stdout:
+                for line in stdout.strip().split('\n'):
                     logger.info(f"[CGAL] {line}")
             
             if os.path.exists(output_path):
@@ -1,7 +1,20 @@
 import os
+import re
 import subprocess
 import logging
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
 import gmsh
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from medit_io import MeditIO
+except ImportError:
+    from .medit_io import MeditIO
 
 # Configurazione logging
 logging.basicConfig(level=logging.INFO)
@@ -67,12 +80,12 @@ class GmshConverter:
             output_path = os.path.splitext(mesh_path)[0] + ".obj"
 
         try:
-            if not gmsh.isInitialized():
-                gmsh.initialize()
-            
-            gmsh.clear()
-            gmsh.merge(mesh_path)
-            gmsh.write(output_path)
+            # Lettura/scrittura diretta con numpy: niente inizializzazione di Gmsh
+            vertices, triangles = MeditIO.read(mesh_path)
+            if vertices is None or len(triangles) == 0:
+                logger.error(f"Nessun triangolo trovato in {mesh_path}")
+                return None
+            MeditIO.write_obj(output_path, vertices, triangles)
             logger.info(f"Conversione MESH -> OBJ completata: {output_path}")
             return output_path
         except Exception as e:
@@ -83,8 +96,106 @@ class MmgRemesher:
     """
     Classe wrapper per l'esecuzione di MMG3D.
     """
+    # Cache dei risultati MMG indicizzata per contenuto dell'input + argomenti (LRU per atime)
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "mmg_cache")
+    CACHE_SIZE = 32
+
+    # Secondi senza righe di avanzamento da MMG oltre i quali il processo e' considerato bloccato
+    STALL_SECONDS = 120
+    # Verbosita' passata a MMG (-v): da 5 in su stampa le righe di iterazione di ogni fase
+    VERBOSITY = 5
+    # Righe di avanzamento: banner di fase, statistiche di iterazione, convergenza
+    _PROGRESS_RE = re.compile(r'PHASE|\biter\b|converg', re.IGNORECASE)
+
+    @staticmethod
+    def _cache_key(mesh_path: str, args: list) -> str:
+        """
+        Chiave di cache: hash del contenuto del file di input + hash degli argomenti MMG.
+        """
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(mesh_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                content_hash.update(chunk)
+        args_hash = hashlib.blake2b(' '.join(args).encode(), digest_size=16)
+        return f"{content_hash.hexdigest()}_{args_hash.hexdigest()}"
+
+    @staticmethod
+    def _cache_store(cached_path: str, output_path: str):
+        """
+        Salva un output in cache ed elimina le voci meno usate oltre CACHE_SIZE.
+        """
+        try:
+            os.makedirs(MmgRemesher.CACHE_DIR, exist_ok=True)
+            shutil.copyfile(output_path, cached_path)
+
+            entries = [os.path.join(MmgRemesher.CACHE_DIR, name) for name in os.listdir(MmgRemesher.CACHE_DIR)]
+            entries.sort(key=os.path.getatime, reverse=True)
+            for stale in entries[MmgRemesher.CACHE_SIZE:]:
+                os.remove(stale)
+        except Exception as e:
+            logger.warning(f"Impossibile aggiornare la cache MMG: {e}")
+
+    @staticmethod
+    def _run_monitored(cmd: list):
+        """
+        Esegue MMG leggendo l'output riga per riga in un thread separato.
+        Solo le righe di avanzamento (vedi _PROGRESS_RE) contano come progresso:
+        se non ne arriva nessuna per STALL_SECONDS il processo viene terminato.
+        
+        Returns:
+            tuple: (return code, output) oppure (None, output) in caso di stallo.
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        output = []
+        last_progress = [time.monotonic()]
+
+        def reader():
+            for line in proc.stdout:
+                output.append(line)
+                if MmgRemesher._PROGRESS_RE.search(line):
+                    last_progress[0] = time.monotonic()
+
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+
+        while proc.poll() is None:
+            if time.monotonic() - last_progress[0] > MmgRemesher.STALL_SECONDS:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                thread.join(timeout=1)
+                return None, "".join(output)
+            time.sleep(0.5)
+
+        thread.join()
+        return proc.returncode, "".join(output)
+
+    @staticmethod
+    def size_options(bounds_min: np.ndarray, bounds_max: np.ndarray) -> list:
+        """
+        Costruisce le opzioni MMG in base alla dimensione dell'input:
+        tolleranze relative alla diagonale del bounding box.
+        La rilevazione dei ridge resta attiva: per disattivarla il chiamante passa "-nr" nelle opzioni.
+        
+        Args:
+            bounds_min (np.ndarray): Minimo del bounding box (3,).
+            bounds_max (np.ndarray): Massimo del bounding box (3,).
+            
+        Returns:
+            list: Argomenti MMG (-hausd, -hmax).
+        """
+        if bounds_min is None or bounds_max is None:
+            return ["-hausd", "0.005"]
+
+        diag = float(np.linalg.norm(bounds_max - bounds_min))
+        return ["-hausd", f"{diag * 1e-3:.6g}", "-hmax", f"{diag * 0.05:.6g}"]
+
     @staticmethod
-    def optimize(mesh_path: str, output_path: str = None, mode: str = 'surface', options: list = None) -> str:
+    def optimize(mesh_path: str, output_path: str = None, mode: str = 'surface', options: list = None,
+                 auto_params: bool = False) -> str:
         """
         Esegue l'ottimizzazione MMG sul file specificato.
         
@@ -93,6 +204,9 @@ class MmgRemesher:
             output_path (str, optional): Output .mesh file. Defaults to *_optim.mesh.
             mode (str): 'surface' per mmgs_O3, 'volume' per mmg3d_O3.
             options (list, optional): Opzioni aggiuntive.
+            auto_params (bool): Se True e options non contiene -hausd, ricava -hausd/-hmax
+                                dal bounding box dell'input (vedi size_options).
+                                Default False: -hausd 0.005 fisso.
         """
         if not os.path.exists(mesh_path):
             logger.error(f"File mesh non trovato: {mesh_path}")
@@ -109,23 +223,141 @@ class MmgRemesher:
             tool = "mmgs_O3"
             # tool = "mmg3d_O3"
             
-        cmd = [tool, "-in", mesh_path, "-out", output_path, "-hausd", "0.005", "-optim", "-noinsert", "-nomove", "-noswap"]
+        options = list(options) if options else []
+        if "-hausd" not in options:
+            if auto_params:
+                # Solo il blocco Vertices viene letto, i triangoli non servono
+                options = MmgRemesher.size_options(*MeditIO.read_bounds(mesh_path)) + options
+            else:
+                options = ["-hausd", "0.005"] + options
+            
+        cmd = [tool, "-in", mesh_path, "-out", output_path, "-optim", "-noinsert", "-nomove", "-noswap"]
+        cmd.extend(options)
+        # Verbosita' sufficiente per le righe di iterazione usate dal controllo di stallo
+        if "-v" not in options:
+            cmd.extend(["-v", str(MmgRemesher.VERBOSITY)])
         
-        if options:
-            cmd.extend(options)
+        # L'output e' deterministico dati input e argomenti (path esclusi)
+        args = [tool] + cmd[5:]
+        cache_key = MmgRemesher._cache_key(mesh_path, args)
+        cached_path = os.path.join(MmgRemesher.CACHE_DIR, cache_key + os.path.splitext(output_path)[1])
+        if os.path.exists(cached_path):
+            shutil.copyfile(cached_path, output_path)
+            os.utime(cached_path)
+            logger.info(f"Risultato {tool} trovato in cache: {output_path}")
+            return output_path
         
         logger.info(f"Esecuzione {tool}: {' '.join(cmd)}")
         try:
-            # Esegue il comando. Check=True solleva eccezione se fallisce.
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, output = MmgRemesher._run_monitored(cmd)
             
-            if result.returncode != 0:
-                logger.error(f"Errore {tool} (Code {result.returncode}): {result.stderr}")
-                logger.error(f"{tool} Output: {result.stdout}")
+            if returncode is None:
+                # Nessun rilassamento automatico della tolleranza: l'output sarebbe piu' grossolano
+                # senza che il chiamante lo sappia
+                logger.error(f"{tool} terminato: nessuna riga di avanzamento per {MmgRemesher.STALL_SECONDS}s "
+                             f"({mesh_path}). Aumentare MmgRemesher.STALL_SECONDS se la fase e' solo lenta.")
+                logger.error(f"{tool} Output (ultime righe): {''.join(output.splitlines(True)[-20:])}")
+                return None
+            
+            if returncode != 0:
+                logger.error(f"Errore {tool} (Code {returncode})")
+                logger.error(f"{tool} Output: {output}")
                 return None
                 
+            MmgRemesher._cache_store(cached_path, output_path)
             logger.info(f"Ottimizzazione {tool} completata: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Eccezione durante esecuzione {tool}: {e}")
             return None
+
+    @staticmethod
+    def optimize_parallel(mesh_path: str, output_path: str = None, n_procs: int = None, options: list = None,
+                          auto_params: bool = False) -> str:
+        """
+        Esegue mmgs_O3 in parallelo partizionando la superficie nelle sue componenti connesse.
+        Le componenti sono disgiunte, quindi gli output si uniscono senza cuciture.
+        
+        Args:
+            mesh_path (str): Input .mesh/.meshb file.
+            output_path (str, optional): Output .mesh/.meshb file. Defaults to *_optim con la stessa estensione.
+            n_procs (int, optional): Numero di processi MMG concorrenti. Default: os.cpu_count().
+            options (list, optional): Opzioni aggiuntive.
+            auto_params (bool): Come in optimize, ma calcolato sulla mesh completa.
+        """
+        if not os.path.exists(mesh_path):
+            logger.error(f"File mesh non trovato: {mesh_path}")
+            return None
+
+        if output_path is None:
+            base, ext = os.path.splitext(mesh_path)
+            output_path = f"{base}_optim{ext}"
+
+        if n_procs is None:
+            n_procs = os.cpu_count() or 1
+
+        vertices, triangles = MeditIO.read(mesh_path)
+        if vertices is None or len(triangles) == 0:
+            return MmgRemesher.optimize(mesh_path, output_path, options=options)
+
+        # Parametri ricavati dalla mesh completa, uguali per tutte le partizioni
+        options = list(options) if options else []
+        if "-hausd" not in options and auto_params:
+            options = MmgRemesher.size_options(vertices.min(axis=0), vertices.max(axis=0)) + options
+
+        labels = MeditIO.split_components(triangles, len(vertices))
+        components, tri_counts = np.unique(labels, return_counts=True)
+
+        n_parts = min(n_procs, len(components))
+        if n_parts <= 1:
+            return MmgRemesher.optimize(mesh_path, output_path, options=options)
+
+        # Bilanciamento: assegna le componenti (dalla piu' grande) alla partizione piu' scarica
+        part_of_component = {}
+        part_load = [0] * n_parts
+        for idx in np.argsort(tri_counts)[::-1]:
+            part = part_load.index(min(part_load))
+            part_of_component[components[idx]] = part
+            part_load[part] += tri_counts[idx]
+        tri_part = np.array([part_of_component[c] for c in labels])
+
+        logger.info(f"Partizionamento in {n_parts} parti ({len(components)} componenti connesse)")
+
+        # Partizioni in formato binario .meshb: niente stampa/parsing ASCII dei float.
+        # Tutti i file intermedi stanno in una cartella dedicata, rimossa in un colpo solo.
+        part_dir = tempfile.mkdtemp(prefix="mmg_parts_", dir=os.path.dirname(os.path.abspath(output_path)))
+        base = os.path.join(part_dir, os.path.splitext(os.path.basename(output_path))[0])
+        part_inputs = []
+        for part in range(n_parts):
+            part_tris = triangles[tri_part == part]
+            used, local_tris = np.unique(part_tris, return_inverse=True)
+            part_in = f"{base}_part{part}.meshb"
+            MeditIO.write(part_in, vertices[used], local_tris.reshape(-1, 3))
+            part_inputs.append(part_in)
+
+        part_outputs = [f"{base}_part{part}_optim.meshb" for part in range(n_parts)]
+        with ThreadPoolExecutor(max_workers=n_parts) as executor:
+            results = list(executor.map(
+                lambda io: MmgRemesher.optimize(io[0], io[1], options=options),
+                zip(part_inputs, part_outputs)
+            ))
+
+        merged_path = None
+        if all(results):
+            # Unione degli output con offset degli indici
+            all_vertices, all_triangles = [], []
+            offset = 0
+            for part_out in part_outputs:
+                v, t = MeditIO.read(part_out)
+                all_vertices.append(v)
+                all_triangles.append(t + offset)
+                offset += len(v)
+            merged_path = MeditIO.write(output_path, np.vstack(all_vertices), np.vstack(all_triangles))
+            logger.info(f"Ottimizzazione parallela completata: {output_path}")
+        else:
+            logger.error("Ottimizzazione parallela fallita su almeno una partizione")
+
+        # Pulizia file parziali
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+        return merged_path
@@ -42,19 +42,21 @@ class RoughnessGenerator:
             normal_img = cv2.imread(target_file, cv2.IMREAD_COLOR)
             if normal_img is None: return None
             
-            normal_f = normal_img.astype(np.float32) / 255.0
-            
-            # Sobel Gradients
-            channel_x = normal_f[:,:,2]
-            channel_y = normal_f[:,:,1]
-            grad_x = cv2.Sobel(channel_x, cv2.CV_32F, 1, 0, ksize=3)
-            grad_y = cv2.Sobel(channel_y, cv2.CV_32F, 0, 1, ksize=3)
+            # Sobel Gradients straight on the 8 bit channels, the 1/255 normalization
+            # is folded into the Sobel scale (no float copy of the whole image)
+            channel_x = normal_img[:,:,2]
+            channel_y = normal_img[:,:,1]
+            grad_x = cv2.Sobel(channel_x, cv2.CV_32F, 1, 0, ksize=3, scale=1.0 / 255.0)
+            grad_y = cv2.Sobel(channel_y, cv2.CV_32F, 0, 1, ksize=3, scale=1.0 / 255.0)
             magnitude = cv2.magnitude(grad_x, grad_y)
             
-            roughness_map = np.clip(magnitude * 2.0, 0, 1)
+            # roughness = 0.4 + 0.6 * clip(2 * magnitude, 0, 1), fused in place in 8 bit units
+            # (magnitude >= 0, so only the upper clip is needed)
             base_roughness = 0.4
-            roughness_final = base_roughness + (roughness_map * 0.6)
-            roughness_final = np.clip(roughness_final, 0, 1)
+            np.minimum(magnitude, 0.5, out=magnitude)
+            magnitude *= 2.0 * 0.6 * 255.0
+            magnitude += base_roughness * 255.0
+            roughness_final = magnitude.astype(np.uint8)
             
             return RoughnessGenerator._save_map(tex_folder, target_file, roughness_final, 'ROUGHNESS')
         except Exception as e:
@@ -72,8 +74,6 @@ class RoughnessGenerator:
             ao_img = cv2.imread(target_file, cv2.IMREAD_GRAYSCALE)
             if ao_img is None: return None
             
-            ao_f = ao_img.astype(np.float32) / 255.0
-            
             # Logic AO -> Roughness
             # Low AO (Black/Cavity) -> Dirt/Dust -> Often Rough (High/White Roughness)
             # High AO (White/Exposed) -> Clean/Worn -> Often Smooth (Low/Black or Medium Roughness)
@@ -87,10 +87,12 @@ class RoughnessGenerator:
             # Cavity -> 0.9 (Rough)
             # Surface -> 0.3 (Base Satin)
             
-            inv_ao = 1.0 - ao_f
-            roughness_final = 0.3 + (inv_ao * 0.6) # Base 0.3, Cavities reach 0.9
-            
-            roughness_final = np.clip(roughness_final, 0, 1)
+            # roughness = 0.3 + 0.6 * (1 - ao), Base 0.3, Cavities reach 0.9.
+            # Only 256 possible inputs: the inversion and the ramp are tabulated once
+            # (0.9 * 255 - 0.6 * ao, always within [0, 255]) and applied with a single
+            # 8 bit lookup pass, no float image
+            lut = (0.9 * 255.0 - 0.6 * np.arange(256, dtype=np.float32)).astype(np.uint8)
+            roughness_final = cv2.LUT(ao_img, lut)
              
             return RoughnessGenerator._save_map(tex_folder, target_file, roughness_final, 'ROUGHNESS')
         except Exception as e:
@@ -99,13 +101,18 @@ class RoughnessGenerator:
 
     @staticmethod
     def _find_map(folder, keyword):
-        candidates = [f for f in os.listdir(folder) if keyword in f.upper() and f.lower().endswith(('.png', '.jpg', '.tif', '.exr'))]
-        if candidates: return os.path.join(folder, candidates[0])
+        # Single directory pass that stops at the first match (no full listing)
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                name = entry.name
+                if keyword in name.upper() and name.lower().endswith(('.png', '.jpg', '.tif', '.exr')):
+                    return entry.path
         return None
 
     @staticmethod
     def _save_map(folder, source_file, data, suffix):
-        roughness_save = (data * 255).astype(np.uint8)
+        # Float maps are in [0, 1], 8 bit maps are saved as they are
+        roughness_save = data if data.dtype == np.uint8 else (data * 255).astype(np.uint8)
         base_name = os.path.basename(source_file)
         
         # Replacement strategy
@@ -126,6 +133,10 @@ class RoughnessGenerator:
              out_name = f"{name_part}_{suffix}{ext}"
 
         output_path = os.path.join(folder, out_name)
-        cv2.imwrite(output_path, roughness_save)
+        # Fast PNG encode (zlib level 1, larger file but much quicker to write);
+        # JPEG keeps OpenCV's default quality (95)
+        ext = os.path.splitext(out_name)[1].lower()
+        params = [cv2.IMWRITE_PNG_COMPRESSION, 1] if ext == '.png' else []
+        cv2.imwrite(output_path, roughness_save, params)
         logger.info(f"Saved Roughness Map: {output_path}")
         return output_path
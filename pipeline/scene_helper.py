@@ -23,49 +23,28 @@ class SceneHelper:
         logger.info("Starting complete scene cleanup...")
 
         # 1. Remove all objects from scene
-        if bpy.context.view_layer.objects:
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
+        # Direct data removal: no operator dispatch, selection sweep or depsgraph update
+        if bpy.data.objects:
+            bpy.data.batch_remove(list(bpy.data.objects))
         
         # 2. Remove all collections (expect main Scene Collection)
-        for collection in bpy.data.collections:
-            bpy.data.collections.remove(collection)
+        collections = bpy.data.collections
+        for collection in list(collections):
+            collections.remove(collection)
 
         # 3. Purge orphan data-blocks
-        # Iterate over all data collections and remove if no users
-        # Note: Order is important for dependencies (e.g. materials used by mesh)
-        
-        # Delete meshes
-        for mesh in bpy.data.meshes:
-            bpy.data.meshes.remove(mesh)
-
-        # Delete materials
-        for mat in bpy.data.materials:
-            bpy.data.materials.remove(mat)
-
-        # Delete textures
-        for tex in bpy.data.textures:
-            bpy.data.textures.remove(tex)
-            
-        # Delete images
-        for img in bpy.data.images:
-            bpy.data.images.remove(img)
+        # Collected in one list and removed with a single batch_remove: one ID management
+        # pass instead of one per removed block
+        # (Mesh, Materials, Textures, Images, Lights, Cameras, Curves)
+        orphans = []
+        for data_coll in (bpy.data.meshes, bpy.data.materials, bpy.data.textures, bpy.data.images,
+                          bpy.data.lights, bpy.data.cameras, bpy.data.curves):
+            orphans.extend(data_coll)
+        if orphans:
+            bpy.data.batch_remove(orphans)
 
-        # Delete lights
-        for light in bpy.data.lights:
-            bpy.data.lights.remove(light)
-
-        # Delete cameras
-        for camera in bpy.data.cameras:
-            bpy.data.cameras.remove(camera)
-            
-        # Delete curves
-        for curve in bpy.data.curves:
-            bpy.data.curves.remove(curve)
-
-        # Final 'purge' via orphan operator to be safe (multiple cycles for nested dependencies)
-        for _ in range(3):
-            bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+        # Final 'purge' via orphan operator to be safe (recursive handles nested dependencies)
+        bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
 
         logger.info("Scene cleaned successfully.")
 
@@ -123,14 +102,12 @@ class SceneHelper:
         logger.info(f"Scene cleanup preserving only: {keep_obj.name}")
         
         # 1. Remove all objects except the one to keep
-        bpy.ops.object.select_all(action='DESELECT')
-        
+        # Direct removal: no selection sweep or delete operator
         objs_to_remove = [o for o in bpy.context.scene.objects if o != keep_obj]
         
-        if objs_to_remove:
-            for o in objs_to_remove:
-                o.select_set(True)
-            bpy.ops.object.delete()
+        remove_object = bpy.data.objects.remove
+        for o in objs_to_remove:
+            remove_object(o, do_unlink=True)
             
         # 2. Remove empty collections (optional, but clean)
         # Don't remove master collection or where object resides
@@ -140,7 +117,7 @@ class SceneHelper:
         # Since we deleted objects using 'old' materials,
         # purge will find them as orphans (0 users) and remove them.
         # Materials of 'keep_obj' still have 1 user, so they remain.
-        for _ in range(3):
-            bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+        # A single recursive purge already handles nested dependencies.
+        bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
             
         logger.info("Partial cleanup completed.")
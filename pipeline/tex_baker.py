@@ -14,6 +14,14 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _invert_hints(hints: dict, key: str) -> dict:
+    """Inverts CHANNEL_HINTS into {node type or socket name: (channels, ...)} for O(1) lookups."""
+    inverted = {}
+    for channel, channel_hints in hints.items():
+        for name in channel_hints[key]:
+            inverted.setdefault(name, []).append(channel)
+    return {name: tuple(channels) for name, channels in inverted.items()}
+
 class TextureAnalyzer:
     """
     Class to analyze mesh materials and identify active textures/channels
@@ -30,6 +38,11 @@ class TextureAnalyzer:
         'EMISSION': {'nodes': ['EMISSION'], 'sockets': ['Emission', 'Emission Color', 'Emission Strength']},
         'OPACITY':  {'nodes': ['BSDF_TRANSPARENT'], 'sockets': ['Alpha', 'Transmission', 'Transmission Weight']}
     }
+    
+    # Same hints keyed by node type / socket name: one dict lookup per node or socket
+    # instead of scanning every channel
+    _NODE_CHANNELS = _invert_hints(CHANNEL_HINTS, 'nodes')
+    _SOCKET_CHANNELS = _invert_hints(CHANNEL_HINTS, 'sockets')
 
     @staticmethod
     def get_material_maps(material: bpy.types.Material) -> dict:
@@ -50,18 +63,15 @@ class TextureAnalyzer:
         tree = material.node_tree
         nodes = tree.nodes
         
-        # Find Material Output node
+        # Find Material Output node (the active one, else the first), in a single pass
         output_node = None
         for node in nodes:
-            if node.type == 'OUTPUT_MATERIAL' and node.is_active_output:
-                output_node = node
-                break
-        
-        if not output_node:
-            for node in nodes:
-                if node.type == 'OUTPUT_MATERIAL':
+            if node.type == 'OUTPUT_MATERIAL':
+                if node.is_active_output:
                     output_node = node
                     break
+                if output_node is None:
+                    output_node = node
         
         if not output_node:
             logger.warning(f"No OUTPUT_MATERIAL node found in '{material.name}'.")
@@ -115,10 +125,9 @@ class TextureAnalyzer:
             # Check specific sockets for others
             
         # Generic Logic based on dictionary
-        for channel, hints in TextureAnalyzer.CHANNEL_HINTS.items():
-            if node_type in hints['nodes']:
-                if channel not in detected_channels:
-                    detected_channels[channel] = {'source': f"Node: {node.name} ({node_type})"}
+        for channel in TextureAnalyzer._NODE_CHANNELS.get(node_type, ()):
+            if channel not in detected_channels:
+                detected_channels[channel] = {'source': f"Node: {node.name} ({node_type})"}
 
     @staticmethod
     def _analyze_socket(node, socket, detected_channels):
@@ -130,11 +139,10 @@ class TextureAnalyzer:
              detected_channels['NORMAL'] = {'source': f"Socket: {socket_name} in {node.name}"}
              
         # Generic check on socket names
-        for channel, hints in TextureAnalyzer.CHANNEL_HINTS.items():
-            # Check if socket name matches one of hints
-            if socket_name in hints['sockets'] and socket.is_linked:
-                 if channel not in detected_channels:
-                      detected_channels[channel] = {'source': f"Socket: {socket_name} in {node.name}"}
+        if socket.is_linked:
+            for channel in TextureAnalyzer._SOCKET_CHANNELS.get(socket_name, ()):
+                if channel not in detected_channels:
+                    detected_channels[channel] = {'source': f"Socket: {socket_name} in {node.name}"}
                       
         # Exception: Principled BSDF inputs if they have significant values even without link?
         # For now consider only if linked (texture bake).
@@ -206,10 +214,16 @@ class TextureAnalyzer:
         
         has_materials = False
         
+        # A material shared by several slots is analyzed once
+        seen = set()
+        
         for slot in obj.material_slots:
-            if slot.material:
+            mat = slot.material
+            if mat:
                 has_materials = True
-                mat = slot.material
+                if mat in seen:
+                    continue
+                seen.add(mat)
                 # logger.info(f"Analyzing material: {mat.name}")
                 
                 # 1. Detect Texture/Link based channels
@@ -270,6 +284,19 @@ class TextureBaker:
     Class to handle baking textures from High Poly to Low Poly.
     """
     
+    # Cycles samples per map. Attribute bakes (normal, color, roughness, emission) are
+    # deterministic: extra samples only anti-alias texel edges. AO is path traced and noisy.
+    BAKE_SAMPLES = {
+        'NORMAL': 1,
+        'DIFFUSE': 4,
+        'ROUGHNESS': 4,
+        'EMISSION': 4,
+        'AMBIENT_OCCLUSION': 64
+    }
+    
+    # Image Texture node receiving the bakes (see _assign_image_to_material)
+    BAKE_NODE_NAME = "BakeTarget"
+    
     def __init__(self, resolution=2048, cage_extrusion=0.02, max_ray_distance=0.0, margin=16):
         self.resolution = resolution
         self.cage_extrusion = cage_extrusion
@@ -283,12 +310,15 @@ class TextureBaker:
         prefs = bpy.context.preferences.addons['cycles'].preferences
         try:
             prefs.get_devices()
-            cuda_devices = [d for d in prefs.devices if d.type == 'CUDA']
-            if cuda_devices:
-                prefs.compute_device_type = 'CUDA'
-                for d in cuda_devices: d.use = True
-                bpy.context.scene.cycles.device = 'GPU'
-                logger.info("Cycles configured on GPU (CUDA).")
+            # First available backend wins: OPTIX (RT cores) > CUDA > HIP
+            for backend in ('OPTIX', 'CUDA', 'HIP'):
+                gpu_devices = [d for d in prefs.devices if d.type == backend]
+                if gpu_devices:
+                    prefs.compute_device_type = backend
+                    for d in gpu_devices: d.use = True
+                    bpy.context.scene.cycles.device = 'GPU'
+                    logger.info(f"Cycles configured on GPU ({backend}).")
+                    break
             else:
                 bpy.context.scene.cycles.device = 'CPU'
                 logger.info("Cycles configured on CPU.")
@@ -296,8 +326,12 @@ class TextureBaker:
             bpy.context.scene.cycles.device = 'CPU'
             logger.info("Error GPU config. Using CPU.")
 
-        # Baking Optimizations
-        bpy.context.scene.cycles.samples = 16 
+        # Baking Optimizations: fixed sample count, no adaptive sampling or denoising
+        # (a bake does not use them, the samples are set per map in bake_all)
+        cycles = bpy.context.scene.cycles
+        cycles.samples = 16 
+        cycles.use_adaptive_sampling = False
+        cycles.use_denoising = False
         
     def bake_all(self, high_poly_obj, low_poly_obj, maps_list, base_output_path=None):
         """
@@ -321,17 +355,23 @@ class TextureBaker:
             logger.warning(f"Optimal distance calculation failed: {e}. Using default: {self.cage_extrusion}")
 
         # Object Selection: Select High, then Shift-Select Low (Active)
-        bpy.ops.object.select_all(action='DESELECT')
+        # Only the currently selected objects are touched, no select_all operator dispatch
+        for o in bpy.context.selected_objects:
+            o.select_set(False)
         high_poly_obj.select_set(True)
         low_poly_obj.select_set(True)
         bpy.context.view_layer.objects.active = low_poly_obj
         
         # Pre-Bake Cleanup: Clear Sharp Edges
+        # Directly on the mesh data, no Edit Mode round-trip: sharp edges are the
+        # 'sharp_edge' attribute (Blender 4.1+), older builds expose use_edge_sharp
         logger.info("Pre-bake Low Poly Cleanup: Clear Sharp Edges & Split Normals...")
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.mark_sharp(clear=True)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        lp_mesh = low_poly_obj.data
+        sharp_attr = lp_mesh.attributes.get('sharp_edge')
+        if sharp_attr is not None:
+            lp_mesh.attributes.remove(sharp_attr)
+        elif lp_mesh.edges and hasattr(lp_mesh.edges[0], 'use_edge_sharp'):
+            lp_mesh.edges.foreach_set('use_edge_sharp', np.zeros(len(lp_mesh.edges), dtype=bool))
         
         # Remove custom split normals if present, to avoid conflicts with smooth shading.
         # Blender API changed across versions, so we try multiple compatible paths.
@@ -346,23 +386,19 @@ class TextureBaker:
                 except Exception as e:
                     logger.warning(f"Legacy split normals clear failed: {e}")
 
-            # Fallback operator path (works on newer builds where direct method is absent)
+            # Fallback operator path (works on newer builds where direct method is absent),
+            # run in Object Mode through a context override
             if not cleared_normals:
                 try:
-                    bpy.ops.object.mode_set(mode='EDIT')
-                    bpy.ops.mesh.select_all(action='SELECT')
-                    bpy.ops.mesh.customdata_custom_splitnormals_clear()
-                    bpy.ops.object.mode_set(mode='OBJECT')
+                    with bpy.context.temp_override(object=low_poly_obj, active_object=low_poly_obj):
+                        bpy.ops.mesh.customdata_custom_splitnormals_clear()
                     cleared_normals = True
                 except Exception as e:
                     logger.warning(f"Operator split normals clear failed: {e}")
-                    try:
-                        bpy.ops.object.mode_set(mode='OBJECT')
-                    except Exception:
-                        pass
              
-        # Ensure Shade Smooth
-        bpy.ops.object.shade_smooth()
+        # Ensure Shade Smooth, written on the polygons directly (no operator)
+        lp_mesh.polygons.foreach_set('use_smooth', np.ones(len(lp_mesh.polygons), dtype=bool))
+        lp_mesh.update()
         
         baked_images = {}
         
@@ -375,13 +411,16 @@ class TextureBaker:
             if img_name in bpy.data.images:
                 bpy.data.images.remove(bpy.data.images[img_name])
                 
-            image = bpy.data.images.new(img_name, width=self.resolution, height=self.resolution, alpha=True)
+            # No alpha plane (no map here bakes transparency); every pass but base color and
+            # emission holds data, not color, so it is baked and saved without the sRGB transform
+            image = bpy.data.images.new(img_name, width=self.resolution, height=self.resolution, alpha=False)
+            if map_type not in ('DIFFUSE', 'EMISSION'):
+                image.colorspace_settings.is_data = True
             
             self._assign_image_to_material(low_poly_obj, image)
             
             original_samples = bpy.context.scene.cycles.samples
-            if map_type == 'AMBIENT_OCCLUSION':
-                bpy.context.scene.cycles.samples = 64
+            bpy.context.scene.cycles.samples = self.BAKE_SAMPLES.get(map_type, original_samples)
             
             # Special handling for DIFFUSE: Force Metalness to 0 temporarily
             metalness_state = None
@@ -409,54 +448,77 @@ class TextureBaker:
             
         return baked_images
 
+    @staticmethod
+    def _world_bvh(obj: bpy.types.Object) -> BVHTree:
+        """
+        World-space BVH of a mesh object. The temporary bmesh is freed as soon as the
+        tree is built, and the transform is skipped for identity matrices (meshes
+        joined in world space by the preprocessing).
+        """
+        bm = bmesh.new()
+        try:
+            bm.from_mesh(obj.data)
+            matrix = obj.matrix_world
+            if matrix != matrix.Identity(4):
+                bm.transform(matrix)
+            return BVHTree.FromBMesh(bm)
+        finally:
+            bm.free()
+
     @staticmethod
     def calculate_optimal_cage_distance(
         low_poly_obj: bpy.types.Object,
         high_poly_obj: bpy.types.Object,
         percentile: float = 95.0,
         sample_count: int = 10000,
-        safety_margin: float = 1.2
+        safety_margin: float = 1.2,
+        bvh_high: BVHTree = None
     ) -> dict:
         """
         Calculate optimal cage distance for baking between low and high poly models.
+        
+        Args:
+            bvh_high (BVHTree, optional): Prebuilt world-space BVH of high_poly_obj
+                                          (see _world_bvh), built here if not given.
         """
         # Get mesh data
         # Note: ensure objects are Mesh and have valid data
         low_matrix = low_poly_obj.matrix_world
-        high_matrix = high_poly_obj.matrix_world
         
-        # Build BVH tree for high poly mesh
-        # We must apply transformations for correct comparison in world space
-        bm_high = bmesh.new()
-        bm_high.from_mesh(high_poly_obj.data)
-        bm_high.transform(high_matrix)
-        bvh_high = BVHTree.FromBMesh(bm_high)
+        # Build BVH tree for high poly mesh (world space)
+        if bvh_high is None:
+            bvh_high = TextureBaker._world_bvh(high_poly_obj)
         
-        # Sample points from low poly mesh
-        bm_low = bmesh.new()
-        bm_low.from_mesh(low_poly_obj.data)
-        bm_low.transform(low_matrix)
+        # Sample points from low poly mesh: bulk read of the coordinates, only the
+        # sampled vertices are transformed to world space (single numpy matmul)
+        low_mesh = low_poly_obj.data
+        n_verts = len(low_mesh.vertices)
+        coords = np.empty(n_verts * 3, dtype=np.float64)
+        low_mesh.vertices.foreach_get('co', coords)
+        coords = coords.reshape(-1, 3)
         
-        vertices = [v.co for v in bm_low.verts]
-        
-        if len(vertices) > sample_count:
+        if n_verts > sample_count:
             # Random sample indices
-            indices = np.random.choice(len(vertices), sample_count, replace=False)
-            vertices = [vertices[i] for i in indices]
-        
-        distances = []
-        for vert in vertices:
-            location, normal, index, distance = bvh_high.find_nearest(vert)
+            indices = np.random.choice(n_verts, sample_count, replace=False)
+            coords = coords[indices]
+        
+        matrix = np.array(low_matrix)
+        coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+        
+        # The nearest-point queries remain per vertex (BVHTree has no batch API)
+        distances = np.empty(len(coords))
+        n_found = 0
+        find_nearest = bvh_high.find_nearest
+        for co in coords.tolist():
+            location, normal, index, distance = find_nearest(co)
             if location is not None:
-                distances.append(distance)
+                distances[n_found] = distance
+                n_found += 1
         
-        bm_low.free()
-        bm_high.free()
-        
-        if not distances:
+        if n_found == 0:
             raise ValueError("No valid distances found between meshes")
         
-        distances = np.array(distances)
+        distances = distances[:n_found]
         min_dist = float(np.min(distances))
         max_dist = float(np.max(distances))
         mean_dist = float(np.mean(distances))
@@ -495,14 +557,18 @@ class TextureBaker:
             float: Combined optimal distance
         """
         
+        # One BVH per mesh, each built once and handed to the direction that queries it
+        bvh_high = TextureBaker._world_bvh(high_poly_obj)
+        bvh_low = TextureBaker._world_bvh(low_poly_obj)
+        
         # Calculate low -> high
         result_lh = TextureBaker.calculate_optimal_cage_distance(
-            low_poly_obj, high_poly_obj, percentile, sample_count, safety_margin
+            low_poly_obj, high_poly_obj, percentile, sample_count, safety_margin, bvh_high=bvh_high
         )
         
         # Calculate high -> low
         result_hl = TextureBaker.calculate_optimal_cage_distance(
-            high_poly_obj, low_poly_obj, percentile, sample_count, safety_margin
+            high_poly_obj, low_poly_obj, percentile, sample_count, safety_margin, bvh_high=bvh_low
         )
         
         # Take maximum to ensure both meshes are covered
@@ -518,7 +584,8 @@ class TextureBaker:
             
         for slot in obj.material_slots:
             mat = slot.material
-            if mat and mat.use_nodes:
+            # Keyed by the material itself (no name lookups); shared slots saved once
+            if mat and mat.use_nodes and mat not in state:
                 mat_state = []
                 for node in mat.node_tree.nodes:
                     if node.type == 'BSDF_PRINCIPLED' and "Metallic" in node.inputs:
@@ -534,7 +601,7 @@ class TextureBaker:
                             'links': links_data
                         })
                 if mat_state:
-                    state[mat.name] = mat_state
+                    state[mat] = mat_state
         return state
 
     def _restore_metalness_state(self, obj, state):
@@ -542,10 +609,9 @@ class TextureBaker:
         if not obj or not state:
             return
             
-        for slot in obj.material_slots:
-            mat = slot.material
-            if mat and mat.name in state:
-                mat_state_list = state[mat.name]
+        # State is keyed by material: each one is restored once, even if shared by several slots
+        for mat, mat_state_list in state.items():
+            if mat_state_list:
                 tree = mat.node_tree
                 
                 for node_data in mat_state_list:
@@ -617,8 +683,12 @@ class TextureBaker:
             mat.use_nodes = True
             
         nodes = mat.node_tree.nodes
-        # Search or create Image Texture node
-        tex_node = nodes.new('ShaderNodeTexImage')
+        # Search or create Image Texture node: one bake target node per material, found by
+        # name (O(1)) and retargeted for each map instead of adding a node per bake
+        tex_node = nodes.get(self.BAKE_NODE_NAME)
+        if tex_node is None:
+            tex_node = nodes.new('ShaderNodeTexImage')
+            tex_node.name = self.BAKE_NODE_NAME
         tex_node.image = image
         nodes.active = tex_node # Important: Cycles writes to active selected node
         tex_node.select = True
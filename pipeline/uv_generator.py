@@ -8,28 +8,69 @@ It handles mesh preprocessing, UV generation, scale restoration, and optional UV
 import os
 import sys
 import gc
+import logging
 import argparse
 from pathlib import Path
 from typing import Optional, Tuple
 from dataclasses import dataclass
+from types import SimpleNamespace
 
 import numpy as np
-import trimesh
-import torch
 
-# Import partuv from pip installation FIRST (before modifying sys.path)
-# This ensures we use the compiled _core.so from the pip package
-import partuv
-from partuv.preprocess import preprocess, save_results
+# Optional: JIT kernel for the scale restoration (falls back to NumPy)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
-# Add PartUV source directory for preprocess_utils and pack modules
-# These are not installed via pip but needed for the pipeline
-if '/workspace/PartUV' not in sys.path:
-    sys.path.append('/workspace/PartUV')
+# Heavy dependencies (torch, trimesh, PartUV) are imported on first use, so that
+# MeshTransform / UVGeneratorConfig can be imported without loading the CUDA stack
+_TORCH = None
+_PARTUV = None
 
-# Additional PartUV imports that need the source directory
-from preprocess_utils.partfield_official.run_PF import PFInferenceModel
-from pack.pack import pack_mesh
+
+def _torch():
+    """Returns the torch module, imported once."""
+    global _TORCH
+    if _TORCH is None:
+        import torch
+        _TORCH = torch
+    return _TORCH
+
+
+def _partuv() -> SimpleNamespace:
+    """
+    Returns the PartUV entry points, imported once:
+    partuv, preprocess, save_results, PFInferenceModel, pack_mesh.
+    """
+    global _PARTUV
+    if _PARTUV is None:
+        # Import partuv from pip installation FIRST (before modifying sys.path)
+        # This ensures we use the compiled _core.so from the pip package
+        import partuv
+        from partuv.preprocess import preprocess, save_results
+        
+        # Add PartUV source directory for preprocess_utils and pack modules
+        # These are not installed via pip but needed for the pipeline
+        if '/workspace/PartUV' not in sys.path:
+            sys.path.append('/workspace/PartUV')
+        
+        # Additional PartUV imports that need the source directory
+        from preprocess_utils.partfield_official.run_PF import PFInferenceModel
+        from pack.pack import pack_mesh
+        
+        _PARTUV = SimpleNamespace(
+            partuv=partuv,
+            preprocess=preprocess,
+            save_results=save_results,
+            PFInferenceModel=PFInferenceModel,
+            pack_mesh=pack_mesh
+        )
+    return _PARTUV
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -60,15 +101,57 @@ class UVGeneratorConfig:
     
     # Output file names
     output_mesh_name: str = "final_components.obj"
+    
+    # Memory housekeeping: release cached GPU blocks only above this much unused reserve
+    gpu_cache_threshold_mb: int = 256
+    # Full gc.collect() only once this many gen-1 collections ran since the last full one
+    gc_gen2_threshold: int = 10
 
 
 # ============================================================================
 # Mesh Transform Utilities
 # ============================================================================
 
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _restore_scale_kernel(V, out, center, scale):
+        """
+        Fused bounds + rescale over an (N,3) float64 array: one parallel pass for
+        min/max, one for the affine transform. Returns False on degenerate bounds.
+        """
+        n = V.shape[0]
+        lo0 = lo1 = lo2 = np.inf
+        hi0 = hi1 = hi2 = -np.inf
+        for i in prange(n):
+            lo0 = min(lo0, V[i, 0])
+            lo1 = min(lo1, V[i, 1])
+            lo2 = min(lo2, V[i, 2])
+            hi0 = max(hi0, V[i, 0])
+            hi1 = max(hi1, V[i, 1])
+            hi2 = max(hi2, V[i, 2])
+        
+        current_scale = max(hi0 - lo0, max(hi1 - lo1, hi2 - lo2))
+        if not current_scale > 0:
+            return False
+        
+        f = scale / current_scale
+        c0 = (lo0 + hi0) * 0.5
+        c1 = (lo1 + hi1) * 0.5
+        c2 = (lo2 + hi2) * 0.5
+        for i in prange(n):
+            out[i, 0] = (V[i, 0] - c0) * f + center[0]
+            out[i, 1] = (V[i, 1] - c1) * f + center[1]
+            out[i, 2] = (V[i, 2] - c2) * f + center[2]
+        return True
+else:
+    _restore_scale_kernel = None
+
+
 class MeshTransform:
     """Handles mesh bounding box transformations for scale preservation."""
     
+    __slots__ = ('center', 'scale')
+    
     def __init__(self, vertices: np.ndarray):
         """
         Initialize transform parameters from mesh vertices.
@@ -79,33 +162,53 @@ class MeshTransform:
         v_min = vertices.min(axis=0)
         v_max = vertices.max(axis=0)
         self.center = (v_min + v_max) * 0.5
-        self.scale = (v_max - v_min).max()
+        self.scale = float((v_max - v_min).max())
+    
+    @classmethod
+    def from_bounds(cls, bounds: np.ndarray) -> "MeshTransform":
+        """
+        Initialize transform parameters from a (2,3) [min, max] bounds array,
+        e.g. the cached trimesh.Trimesh.bounds, without scanning the vertices.
+        
+        Args:
+            bounds: 2x3 array of minimum and maximum corners
+        """
+        transform = cls.__new__(cls)
+        transform.center = bounds.mean(axis=0)
+        transform.scale = float((bounds[1] - bounds[0]).max())
+        return transform
     
-    def restore_scale(self, vertices: np.ndarray) -> np.ndarray:
+    def restore_scale(self, vertices: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Restore original scale to normalized vertices.
         
         Args:
             vertices: Normalized vertex positions
+            out: Optional output array (may be vertices itself to work in place)
             
         Returns:
             Vertices with original scale restored
         """
-        current_center, current_scale = self._compute_params(vertices)
+        if (_restore_scale_kernel is not None and vertices.dtype == np.float64
+                and vertices.ndim == 2 and vertices.shape[1] == 3):
+            target = np.empty_like(vertices) if out is None else out
+            if _restore_scale_kernel(vertices, target, np.asarray(self.center, dtype=np.float64), self.scale):
+                return target
+            return vertices
         
-        if current_scale > 0:
-            scale_factor = self.scale / current_scale
-            return (vertices - current_center) * scale_factor + self.center
-        return vertices
-    
-    @staticmethod
-    def _compute_params(vertices: np.ndarray) -> Tuple[np.ndarray, float]:
-        """Compute center and scale from vertices."""
         v_min = vertices.min(axis=0)
         v_max = vertices.max(axis=0)
-        center = (v_min + v_max) * 0.5
-        scale = (v_max - v_min).max()
-        return center, scale
+        current_center = (v_min + v_max) * 0.5
+        current_scale = float((v_max - v_min).max())
+        
+        if current_scale <= 0:
+            return vertices
+        
+        # One allocation at most, the scale and offset are applied in place
+        out = np.subtract(vertices, current_center, out=out)
+        out *= self.scale / current_scale
+        out += self.center
+        return out
 
 
 # ============================================================================
@@ -140,19 +243,19 @@ class UVGenerator:
         
         # Determine device
         if device == "auto":
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.device = "cuda" if _torch().cuda.is_available() else "cpu"
         else:
             self.device = device
         
         # Lazy-load the PartField model
-        self._pf_model: Optional[PFInferenceModel] = None
+        self._pf_model = None
     
     @property
-    def pf_model(self) -> PFInferenceModel:
+    def pf_model(self) -> "PFInferenceModel":
         """Lazy-load PartField model on first access."""
         if self._pf_model is None:
-            print(f"Loading PartField model on {self.device}...")
-            self._pf_model = PFInferenceModel(device=self.device)
+            logger.info(f"Loading PartField model on {self.device}...")
+            self._pf_model = _partuv().PFInferenceModel(device=self.device)
         return self._pf_model
     
     def generate_uvs(
@@ -195,11 +298,16 @@ class UVGenerator:
                     mesh_path, hierarchy_path
                 )
             
+            # Restore original scale in memory, so the OBJ is written only once
+            rescaled = False
+            if restore_scale and original_transform:
+                rescaled = self._apply_transform_to_final_parts(final_parts, original_transform)
+            
             # Save results
-            save_results(output_path, final_parts, individual_parts)
+            _partuv().save_results(output_path, final_parts, individual_parts)
             
-            # Restore original scale if requested
-            if restore_scale and original_transform:
+            # Fallback: rescale the written OBJ if the components could not be edited in place
+            if restore_scale and original_transform and not rescaled:
                 self._restore_output_scale(output_path, original_transform)
             
             # Print summary
@@ -212,7 +320,7 @@ class UVGenerator:
             return True
             
         except Exception as e:
-            print(f"Error during UV generation: {e}")
+            logger.error(f"Error during UV generation: {e}")
             raise
         finally:
             # Cleanup
@@ -224,9 +332,10 @@ class UVGenerator:
         output_path: str
     ) -> Tuple:
         """Run pipeline with PartField preprocessing."""
-        print("Running preprocessing with PartField...")
+        logger.info("Running preprocessing with PartField...")
         
-        mesh, tree_filename, tree_dict, preprocess_times = preprocess(
+        pu = _partuv()
+        mesh, tree_filename, tree_dict, preprocess_times = pu.preprocess(
             mesh_path,
             self.pf_model,
             output_path,
@@ -237,9 +346,9 @@ class UVGenerator:
             merge_vertices_epsilon=self.config.merge_vertices_epsilon
         )
         
-        print(f"Mesh after preprocessing: {mesh.faces.shape[0]} faces, {mesh.vertices.shape[0]} vertices")
+        logger.info(f"Mesh after preprocessing: {mesh.faces.shape[0]} faces, {mesh.vertices.shape[0]} vertices")
         
-        final_parts, individual_parts = partuv.pipeline_numpy(
+        final_parts, individual_parts = pu.partuv.pipeline_numpy(
             V=mesh.vertices,
             F=mesh.faces,
             tree_dict=tree_dict,
@@ -255,9 +364,9 @@ class UVGenerator:
         hierarchy_path: str
     ) -> Tuple:
         """Run pipeline with pre-computed hierarchy."""
-        print(f"Using pre-computed hierarchy: {hierarchy_path}")
+        logger.info(f"Using pre-computed hierarchy: {hierarchy_path}")
         
-        final_parts, individual_parts = partuv.pipeline(
+        final_parts, individual_parts = _partuv().partuv.pipeline(
             tree_filename=hierarchy_path,
             mesh_filename=mesh_path,
             configPath=self.config.config_path,
@@ -268,66 +377,148 @@ class UVGenerator:
     
     def _get_original_transform(self, mesh_path: str) -> MeshTransform:
         """Load mesh and compute original transform parameters."""
-        print("Computing original mesh transform...")
-        mesh = trimesh.load(mesh_path, process=False, force='mesh')
-        transform = MeshTransform(mesh.vertices)
-        print(f"  Center: {transform.center}")
-        print(f"  Scale: {transform.scale}")
-        del mesh
+        logger.debug("Computing original mesh transform...")
+        vertices = self._read_obj_vertices(mesh_path)
+        if vertices is not None:
+            transform = MeshTransform(vertices)
+            del vertices
+        else:
+            import trimesh
+            mesh = trimesh.load(mesh_path, process=False, force='mesh')
+            transform = MeshTransform.from_bounds(mesh.bounds)
+            del mesh
+        logger.debug(f"  Center: {transform.center}")
+        logger.debug(f"  Scale: {transform.scale}")
         return transform
     
+    @staticmethod
+    def _read_obj_vertices(mesh_path: str) -> Optional[np.ndarray]:
+        """
+        Read only the vertex positions of an OBJ file.
+        
+        Faces, UVs and normals are skipped, so this is much cheaper than a full
+        trimesh load when only the bounds are needed.
+        
+        Returns:
+            Nx3 array of vertex positions, or None if the file is not a plain OBJ
+        """
+        if not mesh_path.lower().endswith('.obj'):
+            return None
+        
+        with open(mesh_path, 'rb') as f:
+            coords = [line[2:] for line in f if line.startswith(b'v ')]
+        if not coords:
+            return None
+        
+        try:
+            return np.array(b' '.join(coords).split(), dtype=np.float64).reshape(len(coords), 3)
+        except ValueError:
+            # Extra per-vertex values (w, colors): let trimesh handle it
+            return None
+    
+    def _apply_transform_to_final_parts(
+        self,
+        final_parts,
+        original_transform: MeshTransform
+    ) -> bool:
+        """
+        Restore original scale on the in-memory components before they are saved.
+        
+        Args:
+            final_parts: PartUV result, with per-component vertex arrays (component.V)
+            original_transform: Transform of the input mesh
+            
+        Returns:
+            True if the vertices were updated, False if the result layout is not editable
+        """
+        components = getattr(final_parts, "components", None)
+        if not components or not all(hasattr(c, "V") for c in components):
+            return False
+        
+        # Bounds of the whole normalized mesh, over all components
+        current = MeshTransform(np.concatenate([np.asarray(c.V) for c in components]))
+        if current.scale <= 0:
+            return True
+        
+        scale_factor = original_transform.scale / current.scale
+        translation = original_transform.center - current.center * scale_factor
+        
+        logger.info("Restoring original scale...")
+        for i, component in enumerate(components):
+            try:
+                component.V = np.asarray(component.V) * scale_factor + translation
+            except (AttributeError, TypeError):
+                # Read-only binding: only safe to fall back if nothing was touched yet
+                if i == 0:
+                    return False
+                raise
+        return True
+    
     def _restore_output_scale(
         self,
         output_path: str,
         original_transform: MeshTransform
     ):
-        """Restore original scale to output mesh."""
+        """Restore original scale to output mesh (fallback, reloads the saved OBJ)."""
         output_mesh_path = os.path.join(output_path, self.config.output_mesh_name)
         
-        if not os.path.exists(output_mesh_path):
-            print(f"Warning: Output mesh not found at {output_mesh_path}")
+        import trimesh
+        
+        # The load doubles as existence check (no separate stat)
+        try:
+            mesh = trimesh.load(output_mesh_path, process=False)
+        except (FileNotFoundError, ValueError):
+            logger.warning(f"Output mesh not found at {output_mesh_path}")
             return
         
-        print("Restoring original scale...")
-        mesh = trimesh.load(output_mesh_path, process=False)
+        logger.info("Restoring original scale...")
         mesh.vertices = original_transform.restore_scale(mesh.vertices)
         mesh.export(output_mesh_path, file_type="obj")
-        print(f"  Saved to {output_mesh_path}")
+        logger.debug(f"  Saved to {output_mesh_path}")
     
     def _pack_uvs(self, output_path: str):
         """Pack UV islands using specified method."""
-        print(f"Packing UVs with {self.config.pack_method}...")
+        logger.info(f"Packing UVs with {self.config.pack_method}...")
         try:
-            pack_mesh(
+            _partuv().pack_mesh(
                 output_path,
                 uvpackmaster=(self.config.pack_method == "uvpackmaster"),
                 save_visuals=self.config.save_visuals
             )
         except Exception as e:
-            print(f"Warning: UV packing failed: {e}")
+            logger.warning(f"UV packing failed: {e}")
     
     def _print_summary(self, final_parts, individual_parts):
-        """Print pipeline results summary."""
-        print("\n" + "="*50)
-        print("UV Generation Complete")
-        print("="*50)
-        print(f"  Components: {final_parts.num_components}")
-        print(f"  Max distortion: {final_parts.distortion:.4f}")
-        print(f"  Individual parts: {len(individual_parts)}")
-        
-        if final_parts.num_components > 0:
+        """Log pipeline results summary."""
+        logger.info(
+            f"UV Generation Complete: {final_parts.num_components} components, "
+            f"max distortion {final_parts.distortion:.4f}, {len(individual_parts)} individual parts"
+        )
+        
+        # getUV() materializes the whole UV array: only worth it when it is logged
+        if final_parts.num_components > 0 and logger.isEnabledFor(logging.DEBUG):
             uv_coords = final_parts.getUV()
-            print(f"  UV coordinates: {uv_coords.shape}")
-        print("="*50 + "\n")
+            logger.debug(f"  UV coordinates: {uv_coords.shape}")
     
     def _clear_gpu_cache(self):
-        """Clear GPU memory cache."""
-        if torch.cuda.is_available():
+        """
+        Clear GPU memory cache.
+        
+        empty_cache() synchronizes the device, so it is only called when the
+        caching allocator holds enough unused memory to be worth returning.
+        """
+        torch = _torch()
+        if not torch.cuda.is_available():
+            return
+        unused = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+        if unused > self.config.gpu_cache_threshold_mb * 1024 * 1024:
             torch.cuda.empty_cache()
     
     def _cleanup(self):
-        """Force garbage collection and clear GPU cache."""
-        gc.collect()
+        """Garbage collection (only after enough young collections) and GPU cache release."""
+        # Oldest generation counter: gen-1 collections since the last full one
+        if gc.get_count()[2] > self.config.gc_gen2_threshold:
+            gc.collect()
         self._clear_gpu_cache()
 
 
@@ -422,9 +613,9 @@ def main():
     )
     
     if success:
-        print("Done!")
+        logger.info("Done!")
     else:
-        print("Pipeline failed!")
+        logger.error("Pipeline failed!")
         sys.exit(1)
 
 
@@ -1,5 +1,6 @@
 import bpy
 import logging
+import numpy as np
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -26,17 +27,22 @@ class UVPacker:
             logger.error(f"Object {obj.name} is not a mesh.")
             return False
             
-        # Ensure object is active and selected
-        bpy.ops.object.select_all(action='DESELECT')
+        # Ensure object is active and selected (deselect only what is selected, no operator)
+        for o in bpy.context.selected_objects:
+            o.select_set(False)
         obj.select_set(True)
         bpy.context.view_layer.objects.active = obj
         
+        # Select all faces to include all UVs in packing: written on the mesh data while
+        # still in Object Mode, so Edit Mode is entered once, only for the pack operator
+        mesh = obj.data
+        mesh.vertices.foreach_set('select', np.ones(len(mesh.vertices), dtype=bool))
+        mesh.edges.foreach_set('select', np.ones(len(mesh.edges), dtype=bool))
+        mesh.polygons.foreach_set('select', np.ones(len(mesh.polygons), dtype=bool))
+        
         # Switch to Edit Mode
         bpy.ops.object.mode_set(mode='EDIT')
         
-        # Select all faces to include all UVs in packing
-        bpy.ops.mesh.select_all(action='SELECT')
-        
         # Select all UV vertices in UV Editor (required for pack_islands)
         # Note: bpy.ops.uv.select_all works on UV/Image Editor context.
         # In background mode might require context override if not working directly.